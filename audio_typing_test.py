@@ -11,15 +11,12 @@ try:
     import darkdetect
 except Exception:
     darkdetect = None
-import docx
-import PyPDF2
 import time
 import os
 import sys
-import threading
-import re
 import csv
 import json
+import queue
 import hashlib
 import shutil
 import base64
@@ -74,25 +71,14 @@ NEUMORPH_FONTS = {
     "icon": ("Segoe UI", 16, "bold")
 }
 
-ROAD_VARIATIONS = {
-    "street": ["street", "st", "st."],
-    "avenue": ["avenue", "ave", "ave."],
-    "road": ["road", "rd", "rd."],
-    "boulevard": ["boulevard", "blvd", "blvd."],
-    "drive": ["drive", "dr", "dr."],
-    "lane": ["lane", "ln", "ln."],
-    "court": ["court", "ct", "ct."],
-    "terrace": ["terrace", "ter", "ter.", "terr"],
-    "place": ["place", "pl", "pl."],
-    "square": ["square", "sq", "sq."],
-    "highway": ["highway", "hwy", "hwy."],
-    "parkway": ["parkway", "pkwy", "pkwy."],
-    "circle": ["circle", "cir", "cir."],
-    "trail": ["trail", "trl", "trl."],
-    "way": ["way", "wy", "wy."]
-}
-
 from tts_manager import TTSManager
+from text_normalizer import TextNormalizer
+from generation_cache import GenerationCache
+from speculative_synthesis import SpeculativeSynthesizer
+from tts_scheduler import TTSJobScheduler
+from document_ingest import DocumentIngestor, file_dialog_types
+from text_cache import TextCache
+from document_identity import DocumentIdentity
 from text_manager import TextManager
 from progress_bar_manager import ProgressBarManager
 
@@ -122,9 +108,11 @@ class AudioTypingTest:
         self.app_data_dir = self.load_app_data_dir()
         self.details_dir = self.app_data_dir / "Details"
         self.generations_dir = self.app_data_dir / "Generations"
+        self.text_cache_dir = self.app_data_dir / "DocumentText"
         self.scores_file = self.app_data_dir / "scores.enc"
         self.tts_temp_file = self.app_data_dir / "TypingTTS.wav"
         self.ensure_app_dirs()
+        self.refresh_caches()
         self.current_detail_key = None
         self.current_file_key = None
         self.current_details = []
@@ -157,7 +145,23 @@ class AudioTypingTest:
         self.current_language = "English"
 
         self.setup_ui()
-        self.tts_manager = TTSManager(filename=str(self.tts_temp_file))
+        audio_config = self.load_config()
+        self.text_normalizer = TextNormalizer()
+        self.tts_manager = TTSManager(
+            filename=str(self.tts_temp_file),
+            synthesis_workers=self.get_synthesis_workers(),
+            speed_mode=audio_config.get("speed_mode", "stretch"),
+            memmap_min_seconds=self.get_memmap_min_seconds(),
+            compact_audio=bool(audio_config.get("compact_audio", False)),
+            resample_to_device=bool(audio_config.get("resample_to_device", True)),
+            segment_cache=self.segment_cache,
+            text_normalizer=self.text_normalizer if audio_config.get("normalize_text", True) else None
+        )
+        self.tts_manager.preload_voices(self.voice_options.values())
+        self.tts_scheduler = TTSJobScheduler()
+        self.document_ingestor = DocumentIngestor(text_cache=self.text_cache)
+        self.speculative_synthesizer = self.create_speculative_synthesizer(audio_config)
+        self.recent_speeds = []  # speeds applied this session, most recent last
         self.tts_from_file = False
         self.progress_bar_manager = ProgressBarManager(
             self.root,
@@ -171,7 +175,6 @@ class AudioTypingTest:
         self.text_manager.typing_box.bind("<KeyPress>", self.start_timer_if_needed)
         self.start_time = None
         self.timer_id = None  # For scheduling timer updates
-        self.road_variant_map = self.build_road_variant_map()
         self.apply_saved_settings()
         self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
@@ -575,6 +578,24 @@ class AudioTypingTest:
         if self.import_app_data(src):
             messagebox.showinfo("Import Complete", "Data imported successfully. Please restart the app to ensure all settings reload.")
 
+    def get_synthesis_workers(self):
+        # "auto" (the default) uses half the cores, capped so model memory stays modest
+        value = self.load_config().get("synthesis_workers", "auto")
+        try:
+            return max(1, int(value))
+        except (TypeError, ValueError):
+            return max(1, min(4, (os.cpu_count() or 2) // 2))
+
+    def get_memmap_min_seconds(self):
+        # Recordings at least this long play from disk-backed scratch files; null disables
+        value = self.load_config().get("memmap_min_minutes", 20)
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value)) * 60.0
+        except (TypeError, ValueError):
+            return 20 * 60.0
+
     def load_app_data_dir(self):
         config = self.load_config()
         configured = config.get("app_data_dir")
@@ -601,6 +622,99 @@ class AudioTypingTest:
         for path in [self.app_data_dir, self.details_dir, self.generations_dir]:
             path.mkdir(parents=True, exist_ok=True)
 
+    def create_generation_cache(self):
+        try:
+            max_mb = float(self.load_config().get("generation_cache_mb", 2048))
+        except (TypeError, ValueError):
+            max_mb = 2048.0
+        return GenerationCache(self.generations_dir, max_bytes=int(max_mb * 1024 * 1024))
+
+    def create_segment_cache(self):
+        # Per-sentence audio, so editing a document only re-synthesizes changed sentences
+        try:
+            max_mb = float(self.load_config().get("segment_cache_mb", 512))
+        except (TypeError, ValueError):
+            max_mb = 512.0
+        return GenerationCache(
+            self.generations_dir / "Segments",
+            max_bytes=int(max_mb * 1024 * 1024),
+            autosave=False
+        )
+
+    def refresh_caches(self):
+        self.generation_cache = self.create_generation_cache()
+        self.segment_cache = self.create_segment_cache()
+        if hasattr(self, "tts_manager"):
+            self.tts_manager.segment_cache = self.segment_cache
+        # Documents are keyed by content, so moved or copied tests keep their data
+        self.document_identity = DocumentIdentity(self.app_data_dir / "document_ids.json")
+        self.text_cache = self.create_text_cache()
+        if hasattr(self, "document_ingestor"):
+            self.document_ingestor.text_cache = self.text_cache
+        if getattr(self, "speculative_synthesizer", None):
+            self.speculative_synthesizer.cancel()
+            self.speculative_synthesizer.generation_cache = self.generation_cache
+
+    def create_text_cache(self):
+        # Extracted document text, so reopening a .docx/.pdf skips parsing
+        try:
+            max_mb = float(self.load_config().get("text_cache_mb", 64))
+        except (TypeError, ValueError):
+            max_mb = 64.0
+        return TextCache(
+            self.text_cache_dir,
+            max_bytes=int(max_mb * 1024 * 1024),
+            identity=self.document_identity
+        )
+
+    def create_speculative_synthesizer(self, config):
+        # Pre-synthesizes the likely next speed/language while the app is idle
+        if not config.get("speculative_synthesis", True):
+            return None
+        try:
+            cpu_percent = float(config.get("speculative_cpu_percent", 50))
+            max_mb = float(config.get("speculative_disk_mb", 512))
+        except (TypeError, ValueError):
+            cpu_percent, max_mb = 50.0, 512.0
+        return SpeculativeSynthesizer(
+            self.generation_cache,
+            self.tts_manager,
+            self.tts_scheduler,
+            is_idle=self.is_idle_for_speculation,
+            cpu_percent=cpu_percent,
+            max_bytes=int(max_mb * 1024 * 1024)
+        )
+
+    def is_idle_for_speculation(self):
+        return not (self.generating or self.tts_manager.is_synthesizing or self.is_audio_playing())
+
+    def speculative_variants(self, text):
+        """Likely next (cache key, voice model, speed) for `text`, most likely first."""
+        manager = self.tts_manager
+        speed = round(self.speed_var.get(), 1)
+        current_model = os.path.basename(manager.model_path)
+        # Language toggles first, then speeds used this session, normal speed and the neighbours
+        candidates = [(model, speed) for model in self.voice_options.values() if model != current_model]
+        low, high = float(self.speed_slider.cget("from")), float(self.speed_slider.cget("to"))
+        for other in self.recent_speeds[::-1] + [1.0, speed - 0.2, speed + 0.2]:
+            other = round(other, 1)
+            if low <= other <= high and other != speed:
+                candidates.append((current_model, other))
+        seen = {self.get_generation_key(text)}
+        variants = []
+        for model, other in candidates:
+            key = self.get_generation_key(text, model_name=model, speed=other)
+            if key not in seen:
+                seen.add(key)
+                variants.append((key, model, other))
+        return variants[:3]
+
+    def schedule_speculative_synthesis(self):
+        if not self.speculative_synthesizer:
+            return
+        text = self.tts_manager.getTypingText()
+        self.speculative_synthesizer.schedule(text, self.speculative_variants(text) if text.strip() else [])
+
     def export_app_data(self, dest_path: Path):
         """Package app data and config into a .echo archive."""
         dest_path = Path(dest_path)
@@ -612,7 +726,9 @@ class AudioTypingTest:
                 for path in self.app_data_dir.rglob("*"):
                     if path.is_file():
                         arcname = Path("app_data") / path.relative_to(self.app_data_dir)
-                        zf.write(path, arcname)
+                        # FLAC is already compressed; deflating it again only costs time
+                        compress = zipfile.ZIP_STORED if path.suffix.lower() == ".flac" else None
+                        zf.write(path, arcname, compress_type=compress)
                 # Config
                 if self.config_path.exists():
                     zf.write(self.config_path, Path("config") / self.config_path.name)
@@ -645,9 +761,11 @@ class AudioTypingTest:
             shutil.copytree(new_app_dir, self.app_data_dir)
             self.details_dir = self.app_data_dir / "Details"
             self.generations_dir = self.app_data_dir / "Generations"
+            self.text_cache_dir = self.app_data_dir / "DocumentText"
             self.scores_file = self.app_data_dir / "scores.enc"
             self.tts_temp_file = self.app_data_dir / "TypingTTS.wav"
             self.ensure_app_dirs()
+            self.refresh_caches()
 
             # Restore config
             if new_config.exists():
@@ -688,9 +806,11 @@ class AudioTypingTest:
         self.app_data_dir = new_dir
         self.details_dir = self.app_data_dir / "Details"
         self.generations_dir = self.app_data_dir / "Generations"
+        self.text_cache_dir = self.app_data_dir / "DocumentText"
         self.scores_file = self.app_data_dir / "scores.enc"
         self.tts_temp_file = self.app_data_dir / "TypingTTS.wav"
         self.ensure_app_dirs()
+        self.refresh_caches()
         self.tts_manager.filename = str(self.tts_temp_file)
         self.tts_manager.wav_file = str(self.tts_temp_file)
         self.save_config()
@@ -1021,7 +1141,7 @@ class AudioTypingTest:
 
         control_row = tk.Frame(main_content, bg=self.colors["bg"])
         control_row.grid(row=1, column=0, sticky="ew", pady=(10, 6))
-        control_row.columnconfigure(3, weight=1)
+        control_row.columnconfigure(4, weight=1)
 
         self.load_file_button = ttk.Button(control_row, text="Load Text for TTS", style="NeumoAccent.TButton", command=self.load_file_for_tts)
         self.load_file_button.grid(row=0, column=0, padx=(0, 8))
@@ -1058,8 +1178,18 @@ class AudioTypingTest:
         )
         self.reset_button.pack(fill="both", expand=True)
 
+        sentence_row = tk.Frame(control_row, bg=self.colors["bg"])
+        sentence_row.grid(row=0, column=3, padx=(8, 0), sticky="w")
+        self.sentence_back_button = ttk.Button(sentence_row, text="\u23ee Sentence", style="Neumo.TButton", command=self.replay_sentence)
+        self.sentence_back_button.pack(side="left", padx=(0, 4))
+        self.sentence_next_button = ttk.Button(sentence_row, text="Sentence \u23ed", style="Neumo.TButton", command=self.next_sentence)
+        self.sentence_next_button.pack(side="left", padx=(0, 4))
+        self.loop_sentence_button = ttk.Button(sentence_row, text="Loop Sentence", style="Toggle.TButton", command=self.toggle_loop_sentence)
+        self.loop_sentence_button.pack(side="left")
+        self.sentence_buttons = [self.sentence_back_button, self.sentence_next_button, self.loop_sentence_button]
+
         self.user_chip = ttk.Label(control_row, text="Not signed in", style="Tag.TLabel")
-        self.user_chip.grid(row=0, column=3, sticky="e")
+        self.user_chip.grid(row=0, column=4, sticky="e")
 
         self.progress_area = tk.Frame(main_content, bg=self.colors["bg"])
         self.progress_area.grid(row=2, column=0, sticky="ew", pady=(4, 10))
@@ -1103,9 +1233,14 @@ class AudioTypingTest:
         except Exception:
             pass
 
-        # Delete synthesized files
+        # Delete synthesized files and stop synthesis workers
         try:
+            self.tts_scheduler.close()
+            self.document_ingestor.close()
+            if self.speculative_synthesizer:
+                self.speculative_synthesizer.close()
             self.tts_manager.deleteTTSFile()
+            self.tts_manager.close()
         except Exception:
             pass
 
@@ -1312,6 +1447,16 @@ class AudioTypingTest:
 
         ttk.Button(data_frame, text="Save Directory", style="NeumoAccent.TButton", command=save_dir).grid(row=1, column=1, padx=10, pady=(0, 10), sticky="e")
 
+        cache_stats = self.generation_cache.stats()
+        ttk.Label(
+            data_frame,
+            text=(
+                f"Audio cache: {cache_stats['entries']} files, {cache_stats['bytes'] / (1024 * 1024):.1f} MB "
+                f"(hits {cache_stats['hits']}, misses {cache_stats['misses']})"
+            ),
+            style="Muted.TLabel"
+        ).grid(row=2, column=0, columnspan=3, padx=10, pady=(0, 10), sticky="w")
+
         # Admin management section
         admin_frame = tk.LabelFrame(config_content, text="Admin Management", bg=self.colors["bg"], fg=self.colors["text"])
         admin_frame.pack(fill="x", padx=4, pady=6)
@@ -1770,7 +1915,8 @@ class AudioTypingTest:
             getattr(self, "language_buttons", []),
             self.speed_slider,
             self.apply_speed_button,
-            getattr(self, "highlight_buttons", [])
+            getattr(self, "highlight_buttons", []),
+            getattr(self, "sentence_buttons", [])
         ]
         state = "normal" if self.current_is_admin else "disabled"
         for widget in admin_widgets:
@@ -1835,14 +1981,14 @@ class AudioTypingTest:
 
         errors = []
 
-        for path in [self.details_dir, self.generations_dir]:
+        for path in [self.details_dir, self.generations_dir, self.text_cache_dir]:
             try:
                 if path.exists():
                     shutil.rmtree(path, ignore_errors=False)
             except Exception as exc:
                 errors.append(str(exc))
 
-        for file_path in [self.scores_file, self.tts_temp_file, self.config_path]:
+        for file_path in [self.scores_file, self.tts_temp_file, self.config_path, self.app_data_dir / "document_ids.json"]:
             try:
                 if Path(file_path).exists():
                     Path(file_path).unlink()
@@ -1851,6 +1997,7 @@ class AudioTypingTest:
 
         # Re-create clean directories and empty databases
         self.ensure_app_dirs()
+        self.refresh_caches()
         try:
             self.save_user_db({})
         except Exception as exc:
@@ -1901,89 +2048,156 @@ class AudioTypingTest:
     def load_file_for_tts(self):
         file_path = filedialog.askopenfilename(
             title="Select a Text Document",
-            filetypes=[
-                ("All Supported", "*.txt *.docx *.pdf"),
-                ("Text Files", "*.txt"),
-                ("Word Documents", "*.docx"),
-                ("PDF Files", "*.pdf")
-            ]
+            filetypes=file_dialog_types()
         )
 
         if not file_path:
             return
 
-        text_content = ""
+        # Parsing runs in the background; pages are pre-synthesized as they arrive
+        if self.speculative_synthesizer:
+            self.speculative_synthesizer.cancel()
+        self.show_loading_window("Reading document...", determinate=True)
+        speed = self.speed_var.get()
+        warmup = self.start_segment_warmup(speed)
 
-        try:
-            if file_path.endswith(".txt"):
-                with open(file_path, 'r', encoding='utf-8') as file:
-                    text_content = file.read()
-            elif file_path.endswith(".docx"):
-                doc = docx.Document(file_path)
-                text_content = "\n".join(p.text for p in doc.paragraphs)
-            elif file_path.endswith(".pdf"):
-                with open(file_path, 'rb') as file:
-                    reader = PyPDF2.PdfReader(file)
-                    text_content = "\n".join(p.extract_text() for p in reader.pages if p.extract_text())
+        def on_page(index, total, text):
+            if warmup:
+                warmup[0].put(text)
+            self.root.after(0, lambda: self.update_loading_progress(
+                index + 1, total, f"Reading document... page {index + 1} of {total}"))
+
+        def on_done(text):
+            if warmup:
+                warmup[0].put(None)
+            try:
+                # Hashing and converting older audio stay off the UI thread
+                file_key = self.get_file_key(file_path)
+                self.import_legacy_generations(file_path, text, speed)
+            except OSError as exc:
+                on_error(exc)
+                return
+            self.root.after(0, lambda: self.on_document_loaded(file_path, file_key, text, warmup and warmup[1]))
+
+        def on_error(exc):
+            if warmup:
+                warmup[1].cancel()
+            self.root.after(0, lambda: self.on_document_failed(exc))
+
+        self.document_ingestor.ingest(file_path, on_page=on_page, on_done=on_done, on_error=on_error)
+
+    def start_segment_warmup(self, speed):
+        """Synthesize pages into the segment cache while the rest of the document is read.
+
+        Returns (page queue, job), or None without a segment cache. Put None on
+        the queue after the last page; the generation that follows cancels the
+        job and picks up from the sentences already cached.
+        """
+        manager = self.tts_manager
+        if manager.segment_cache is None:
+            return None
+        pages = queue.Queue()
+        scale = manager.synth_scale_for(speed)
+
+        def work(job):
+            while job.checkpoint():
+                try:
+                    text = pages.get(timeout=0.2)
+                except queue.Empty:
+                    continue
+                if text is None:
+                    return
+                manager.presynthesize(text, length_scale=scale, pace=job.checkpoint)
 
+        return pages, self.tts_scheduler.submit(work)
+
+    def on_document_failed(self, exc):
+        self.hide_loading_window()
+        messagebox.showerror("Error", f"Could not load file:\n{str(exc)}")
+
+    def on_document_loaded(self, file_path, file_key, text_content, warmup_job=None):
+        self.hide_loading_window()
+        try:
             self.tts_manager.typingText = text_content
             self.tts_from_file = True
-            
 
             self.start_time = None
 
-            file_key = self.get_file_key(file_path)
             self.current_file_key = file_key
-            generation_path = self.get_generation_path(file_key)
 
-            if generation_path.is_file():
-                reuse_audio = messagebox.askyesno(
-                    "Existing Audio Found",
-                    f"Audio for this document already exists in {self.current_language}.\n"
-                    "Select Yes to reuse it or No to regenerate."
-                )
-                if reuse_audio and self.load_existing_generation(generation_path, text_content):
-                    self.handle_details_for_file(file_key, text_content)
-                    return
+            # Identical text in the same voice and speed is never synthesized twice
+            cache_key = self.get_generation_key(text_content)
+            generation_path = self.generation_cache.lookup(cache_key)
+            if generation_path and self.load_existing_generation(generation_path, text_content):
+                if warmup_job:
+                    warmup_job.cancel()
+                self.handle_details_for_file(file_key, text_content)
+                return
 
-            self.generate_tts_in_background(text_content, save_key=file_key, language=self.current_language)
+            self.generate_tts_in_background(text_content, cache_key=cache_key)
             self.handle_details_for_file(file_key, text_content)
 
         except Exception as e:
             messagebox.showerror("Error", f"Could not load file:\n{str(e)}")
 
     def get_file_key(self, file_path):
-        abs_path = os.path.abspath(file_path)
-        return hashlib.sha256(abs_path.encode("utf-8")).hexdigest()
-
-    def get_language_slug(self, language=None):
-        language = language or self.current_language
-        return "es" if language == "Spanish" else "en"
-
-    def get_generation_path(self, file_key, language=None):
-        slug = self.get_language_slug(language)
-        slugged = self.generations_dir / f"{file_key}_{slug}.wav"
-        legacy = self.generations_dir / f"{file_key}.wav"
-        if language is not None:
-            if slugged.exists():
-                return slugged
-            if legacy.exists() and (language == "English" or language is None):
-                return legacy
-            return slugged
-        if slugged.exists():
-            return slugged
-        if legacy.exists():
-            return legacy
-        return slugged
+        """Content key of the document; moves Details saved under its old path key."""
+        file_key = self.document_identity.key_for(file_path)
+        details_path = self.details_dir / f"{file_key}.json"
+        legacy_path = self.details_dir / f"{DocumentIdentity.legacy_key(file_path)}.json"
+        if not details_path.exists() and legacy_path.exists():
+            try:
+                os.replace(legacy_path, details_path)
+            except OSError:
+                pass
+        return file_key
+
+    def import_legacy_generations(self, file_path, text_content, speed):
+        """Move audio older versions saved under the document's path into the generation cache.
+
+        Those files (`<path hash>_<language>.wav`, or `<path hash>.wav` for English)
+        carry no speed or word timings; they are adopted at `speed`, as older
+        versions reused them, and deleted either way. They were synthesized from
+        the text as written, so they are keyed without the normalizer variant
+        and only reused while normalization is off. Runs off the UI thread.
+        """
+        legacy_key = DocumentIdentity.legacy_key(file_path)
+        candidates = [
+            ("English", f"{legacy_key}_en.wav"),
+            ("English", f"{legacy_key}.wav"),
+            ("Spanish", f"{legacy_key}_es.wav"),
+        ]
+        manager = self.tts_manager
+        for language, name in candidates:
+            path = self.generations_dir / name
+            model_name = self.voice_options.get(language)
+            if model_name and path.is_file():
+                model_path = os.path.join(manager.voices_dir, model_name)
+                key = self.generation_cache.make_key(text_content, model_path, manager.synth_scale_for(speed))
+                self.generation_cache.import_file(key, path)
+
+    def get_generation_key(self, text, model_name=None, speed=None):
+        """Cache key for `text` in the given (default: current) voice and speed."""
+        manager = self.tts_manager
+        if model_name is None:
+            model_path = manager.model_path
+        else:
+            model_path = os.path.join(manager.voices_dir, model_name)
+        speed = self.speed_var.get() if speed is None else speed
+        variant = f"normalized-v{TextNormalizer.VERSION}" if manager.normalizes_for(model_path) else None
+        return self.generation_cache.make_key(text, model_path, manager.synth_scale_for(speed), variant=variant)
 
     def load_existing_generation(self, generation_path, text_content, show_message=True):
         try:
-            shutil.copy2(generation_path, self.tts_manager.wav_file)
             self.tts_manager.typingText = text_content
             self.tts_manager._last_text = text_content
-            target_scale = self.tts_manager._to_piper_scale(self.speed_var.get())
+            target_scale = self.tts_manager.synth_scale_for(self.speed_var.get())
             self.tts_manager._last_synth_scale = target_scale
-            self.tts_manager.load_audio()
+            self.tts_manager.load_audio(
+                generation_path,
+                speed=self.speed_var.get(),
+                timings=self.generation_cache.load_sidecars(Path(generation_path).stem)
+            )
             self.tts_manager.is_armed = True
             self.tts_manager.is_paused = True
             self.progress_bar_manager.update_audio_duration(speed=self.speed_var.get())
@@ -1991,6 +2205,7 @@ class AudioTypingTest:
             self.update_play_pause_button(False)
             self.speed_dirty = False
             self.update_apply_speed_button()
+            self.schedule_speculative_synthesis()
             if show_message:
                 messagebox.showinfo("Audio Loaded", "Existing audio has been loaded for this document.")
             return True
@@ -2078,52 +2293,27 @@ class AudioTypingTest:
                 revert_selection()
             return
 
-        file_key = getattr(self, "current_file_key", None)
-        new_lang_path = self.get_generation_path(file_key, language=selection) if file_key else None
-        new_audio_exists = bool(new_lang_path and Path(new_lang_path).is_file())
+        cache_key = self.get_generation_key(existing_text, model_name=model_name)
+        new_lang_path = self.generation_cache.lookup(cache_key)
 
         try:
-            prompt_title = "Existing Audio Found" if new_audio_exists else "Regenerate Audio"
-            if new_audio_exists:
-                response = messagebox.askyesnocancel(
-                    prompt_title,
-                    f"Audio for this document already exists in {selection}.\n"
-                    "Yes: Use existing audio\nNo: Regenerate in new language\nCancel: Keep current language/audio"
-                )
-                if response is None:
-                    revert_selection()
-                    return
-                # Apply language change now
-                self.tts_manager.set_voice_model(model_name)
-                self.progress_bar_manager.reset_progress_bar()
-                self.update_play_pause_button(False)
-                self.current_language = selection
-                if hasattr(self, "language_buttons"):
-                    self._update_toggle_styles(self.language_var.get(), self.language_buttons)
-                if response is True:
-                    # Use saved audio
-                    if new_lang_path and not self.load_existing_generation(new_lang_path, existing_text):
-                        self.regeneration_reason = "language"
-                        self.generate_tts_in_background(existing_text, save_key=file_key, language=selection)
-                else:
-                    self.regeneration_reason = "language"
-                    self.generate_tts_in_background(existing_text, save_key=file_key, language=selection)
-            else:
+            if new_lang_path is None:
                 regenerate = messagebox.askyesno(
-                    prompt_title,
+                    "Regenerate Audio",
                     f"Would you like to generate the audio in {selection}?"
                 )
                 if not regenerate:
                     revert_selection()
                     return
-                self.tts_manager.set_voice_model(model_name)
-                self.progress_bar_manager.reset_progress_bar()
-                self.update_play_pause_button(False)
-                self.current_language = selection
-                if hasattr(self, "language_buttons"):
-                    self._update_toggle_styles(self.language_var.get(), self.language_buttons)
+            self.tts_manager.set_voice_model(model_name)
+            self.progress_bar_manager.reset_progress_bar()
+            self.update_play_pause_button(False)
+            self.current_language = selection
+            if hasattr(self, "language_buttons"):
+                self._update_toggle_styles(self.language_var.get(), self.language_buttons)
+            if new_lang_path is None or not self.load_existing_generation(new_lang_path, existing_text):
                 self.regeneration_reason = "language"
-                self.generate_tts_in_background(existing_text, save_key=file_key, language=selection)
+                self.generate_tts_in_background(existing_text, cache_key=cache_key)
             if self.current_is_admin:
                 self.save_ui_settings()
         except FileNotFoundError as exc:
@@ -2295,13 +2485,6 @@ class AudioTypingTest:
         self.try_show_pending_messages()
         return result["value"]
 
-    def build_road_variant_map(self):
-        mapping = {}
-        for canonical, variants in ROAD_VARIATIONS.items():
-            for variant in variants:
-                mapping[variant.lower()] = canonical
-        return mapping
-
     def apply_saved_settings(self):
         settings = self.load_ui_settings()
         if not settings:
@@ -2340,8 +2523,9 @@ class AudioTypingTest:
         self.update_admin_controls()
 
     def normalize_words(self, text):
-        cleaned = re.sub(r'[^\w\s]', ' ', text).lower().split()
-        return [self.road_variant_map.get(word, word) for word in cleaned]
+        # Same expansions as the audio, so "123 Main St." matches what was heard either way;
+        # voices that read the text as written (other languages) only get road names mapped
+        return self.text_normalizer.matching_words(text, expand=self.tts_manager.normalizes_for())
 
     def normalize_text_for_matching(self, text):
         return " ".join(self.normalize_words(text))
@@ -2417,6 +2601,8 @@ class AudioTypingTest:
         self.text_manager.typing_box.tag_remove("incorrect", "1.0", "end")
         self.text_manager.clear_text()
         self.reset_audio(auto_resume=False)
+        if hasattr(self, "loop_sentence_button"):
+            self.loop_sentence_button.config(style="ToggleActive.TButton" if self.tts_manager.loop_sentence is not None else "Toggle.TButton")
         self.update_apply_speed_button()
 
     def toggle_play_pause(self):
@@ -2434,7 +2620,7 @@ class AudioTypingTest:
 
         if getattr(self.tts_manager, "use_synth_speed", False):
             try:
-                target_scale = self.tts_manager._to_piper_scale(speed)
+                target_scale = self.tts_manager.synth_scale_for(speed)
                 last_scale = getattr(self.tts_manager, "_last_synth_scale", None)
                 if last_scale is None or abs(target_scale - last_scale) > 1e-6:
                     need_prepare = True
@@ -2457,6 +2643,36 @@ class AudioTypingTest:
 
         self.update_play_pause_button(True)
 
+    def _has_sentence_index(self):
+        if not self.tts_manager.getTypingText().strip() or self.tts_manager.audio_data is None:
+            messagebox.showwarning("No Document Loaded", "Please load a document before navigating the audio.")
+            return False
+        if self.tts_manager.sentence_index_at() is None:
+            messagebox.showinfo(
+                "No Sentence Index",
+                "This audio was saved without sentence timings.\nRegenerate it to enable sentence navigation."
+            )
+            return False
+        return True
+
+    def replay_sentence(self):
+        if not self.current_is_admin or not self._has_sentence_index():
+            return
+        self.tts_manager.replay_sentence()
+
+    def next_sentence(self):
+        if not self.current_is_admin or not self._has_sentence_index():
+            return
+        self.tts_manager.seek_to_sentence(self.tts_manager.sentence_index_at() + 1)
+
+    def toggle_loop_sentence(self):
+        if not self.current_is_admin:
+            return
+        if self.tts_manager.loop_sentence is None and not self._has_sentence_index():
+            return
+        looping = self.tts_manager.set_loop_sentence(self.tts_manager.loop_sentence is None) is not None
+        self.loop_sentence_button.config(style="ToggleActive.TButton" if looping else "Toggle.TButton")
+
     def reset_audio(self, auto_resume=None):
         """Reset playback to start; optionally resume if it was playing."""
         was_playing = self.is_audio_playing()
@@ -2512,21 +2728,35 @@ class AudioTypingTest:
             self.update_apply_speed_button()
             return
 
-        # Immediately stop and reset playback/test state
+        # Immediately stop and reset playback/test state; in stretch mode this
+        # also re-times the loaded audio, so nothing needs to be synthesized.
         self.reset_for_new_audio()
         self.speed_dirty = False
         self.update_apply_speed_button()
+        applied = round(self.speed_var.get(), 1)
+        self.recent_speeds = [s for s in self.recent_speeds if s != applied][-3:] + [applied]
+        if self.tts_manager.speed_mode == "stretch" and self.tts_manager.audio_data is not None:
+            self.progress_bar_manager.update_audio_duration(speed=self.speed_var.get())
+            self.save_ui_settings()
+            return
+
+        cache_key = self.get_generation_key(text)
+        cached_path = self.generation_cache.lookup(cache_key)
+        if cached_path and self.load_existing_generation(cached_path, text, show_message=False):
+            self.save_ui_settings()
+            return
 
         self.generate_tts_in_background(
             text,
-            save_key=getattr(self, "current_file_key", None),
-            language=self.current_language,
+            cache_key=cache_key,
             message="Regenerating audio..."
         )
         self.regeneration_reason = "speed"
         self.save_ui_settings()
 
-    def show_loading_window(self, message="Generating TTS..."):
+    def show_loading_window(self, message="Generating TTS...", determinate=False):
+        if hasattr(self, "loading_window") and self.loading_window.winfo_exists():
+            self.loading_window.destroy()
         self.generating = True
         self.update_apply_speed_button()
         self.loading_window = tk.Toplevel(self.root)
@@ -2540,15 +2770,24 @@ class AudioTypingTest:
         body_card, body = self._build_card(self.loading_window, padding=14)
         body_card.pack(fill="both", expand=True, padx=16, pady=16)
 
-        label = ttk.Label(body, text=message, style="Muted.TLabel")
-        label.pack(pady=8)
+        self.loading_label = ttk.Label(body, text=message, style="Muted.TLabel")
+        self.loading_label.pack(pady=8)
 
-        progress = ttk.Progressbar(body, mode='indeterminate', length=240, style="Neumo.Horizontal.TProgressbar")
-        progress.pack(pady=8)
-        progress.start()
+        mode = 'determinate' if determinate else 'indeterminate'
+        self.loading_progress = ttk.Progressbar(body, mode=mode, length=240, style="Neumo.Horizontal.TProgressbar")
+        self.loading_progress.pack(pady=8)
+        if not determinate:
+            self.loading_progress.start()
         
         self.fit_window_to_content(self.loading_window, min_size=(320, 140))
 
+    def update_loading_progress(self, done, total, message=None):
+        if not (hasattr(self, "loading_window") and self.loading_window.winfo_exists()):
+            return
+        self.loading_progress.config(maximum=max(total, 1), value=done)
+        if message:
+            self.loading_label.config(text=message)
+
     def hide_loading_window(self):
         if hasattr(self, "loading_window") and self.loading_window.winfo_exists():
             self.loading_window.destroy()
@@ -2569,26 +2808,67 @@ class AudioTypingTest:
             self.pending_file_loaded_message = True
         self.try_show_pending_messages()
         self.regeneration_reason = None
+        self.schedule_speculative_synthesis()
 
-    def generate_tts_in_background(self, text, save_key=None, language=None, message="Generating TTS..."):
-        def task():
-            self.tts_manager.TTSGenerate(text)
-            self.tts_manager.prepareTTS(speed=self.speed_var.get())
-            reload_path = None
-            if save_key:
-                self.save_generation_copy(save_key, language=language)
-                reload_path = self.get_generation_path(save_key, language=language)
-            self.root.after(0, lambda: self.on_tts_ready(reload_path, text))
+    def generate_tts_in_background(self, text, cache_key=None, message="Generating TTS..."):
+        speed = self.speed_var.get()
+        if self.speculative_synthesizer:
+            self.speculative_synthesizer.cancel()
+        streaming = getattr(self.tts_manager, "stream_synthesis", False)
+
+        def on_first_audio():
+            # Streaming: the first sentence is playable, release the UI right away
+            self.root.after(0, lambda: self.on_tts_ready(None, text))
+
+        def task(job):
+            completed = self.tts_manager.TTSGenerate(
+                text,
+                length_scale=self.tts_manager.synth_scale_for(speed),
+                on_first_audio=on_first_audio if streaming else None,
+                speed=speed,
+                pace=job.checkpoint
+            )
+            if streaming:
+                # The cached path is the result, for requests deduplicated onto this job
+                return self.save_generation_copy(cache_key) if completed and cache_key else None
+            if not completed:
+                return None  # superseded by a newer request
+            self.tts_manager.prepareTTS(speed=speed)
+            path = self.save_generation_copy(cache_key) if cache_key else None
+            # Audio is already prepared in memory; no need to reload the saved copy
+            self.root.after(0, lambda: self.on_tts_ready(None, text))
+            return path
 
         self.show_loading_window(message)
-        threading.Thread(target=task, daemon=True).start()
+        # Submitting cancels any older request, so only the latest one uses the CPU
+        job = self.tts_scheduler.submit(task, key=cache_key)
+        if job.work is task:
+            job.add_done_callback(lambda job: self.root.after(0, lambda: self.on_tts_job_failed(job)))
+        else:
+            # The same audio is already being synthesized (usually speculatively)
+            job.add_done_callback(lambda job: self.root.after(0, lambda: self.on_shared_tts_job_done(job, text, cache_key)))
 
-    def save_generation_copy(self, file_key, language=None):
+    def on_tts_job_failed(self, job):
+        if job.error is None:
+            return
+        self.hide_loading_window()
+        messagebox.showerror("TTS Error", f"Could not generate audio:\n{job.error}")
+
+    def on_shared_tts_job_done(self, job, text, cache_key):
+        path = job.result or (cache_key and self.generation_cache.lookup(cache_key))
+        if path and Path(path).is_file():
+            self.on_tts_ready(path, text)
+        elif not job.cancelled:
+            self.hide_loading_window()
+            self.generate_tts_in_background(text, cache_key=cache_key)
+
+    def save_generation_copy(self, cache_key):
+        """Store the current audio under `cache_key`; returns its path, or None if that failed."""
         try:
-            target = self.get_generation_path(file_key, language=language)
-            shutil.copy2(self.tts_manager.wav_file, target)
+            return self.generation_cache.store(cache_key, self.tts_manager.save_audio,
+                                               sidecars=self.tts_manager.timings)
         except Exception:
-            pass
+            return None
 
     def on_typing(self, event):
         user_input = self.text_manager.get_text()
@@ -0,0 +1,94 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright (C) 2025 echoType
+
+import os
+import json
+import mmap
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+
+def hash_file(path, chunk_size=1 << 20):
+    """SHA-256 hex digest of the file's content, fed to the hash in fixed-size chunks.
+
+    Files of a chunk or more are memory-mapped so the chunks are hashed without
+    copying them; anything that cannot be mapped is read instead.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= chunk_size:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as view:
+                    for offset in range(0, size, chunk_size):
+                        digest.update(view[offset:offset + chunk_size])
+                return digest.hexdigest()
+            except (OSError, ValueError):
+                f.seek(0)
+                digest = hashlib.sha256()
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DocumentIdentity:
+    """Identifies documents by content, so renamed, moved or copied files keep their key.
+
+    The key is the SHA-256 of the file's bytes. Hashes are memoized by
+    (device, inode, size, mtime) and saved to `memo_path`, so identifying an
+    unchanged file again (even after a rename) costs one `stat`; only the most
+    recent `max_entries` files are remembered.
+    """
+
+    def __init__(self, memo_path=None, max_entries=4096):
+        self.memo_path = Path(memo_path) if memo_path else None
+        self.max_entries = int(max_entries)
+        self._memo = OrderedDict()  # stat signature -> content hash, oldest first
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def legacy_key(path):
+        """Key earlier versions derived from the absolute path alone."""
+        return hashlib.sha256(os.path.abspath(path).encode("utf-8")).hexdigest()
+
+    def key_for(self, path):
+        stat = os.stat(path)
+        # Some filesystems report no inode; fall back to the path there
+        origin = f"{stat.st_dev}:{stat.st_ino}" if stat.st_ino else os.path.abspath(path)
+        signature = f"{origin}:{stat.st_size}:{stat.st_mtime_ns}"
+        with self._lock:
+            key = self._memo.get(signature)
+            if key is not None:
+                self._memo.move_to_end(signature)
+                return key
+        key = hash_file(path)
+        with self._lock:
+            self._memo[signature] = key
+            while len(self._memo) > self.max_entries:
+                self._memo.popitem(last=False)
+            self._save_locked()
+        return key
+
+    def _load(self):
+        if self.memo_path is None:
+            return
+        try:
+            with open(self.memo_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self._memo.update((k, v) for k, v in data.get("hashes", []))
+
+    def _save_locked(self):
+        if self.memo_path is None:
+            return
+        tmp_path = self.memo_path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "hashes": list(self._memo.items())}, f)
+            os.replace(tmp_path, self.memo_path)
+        except OSError:
+            pass
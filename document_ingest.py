@@ -0,0 +1,398 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright (C) 2025 echoType
+
+import os
+import re
+import zipfile
+import posixpath
+import threading
+import multiprocessing
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import unquote
+
+from text_cache import normalize_document_text
+
+# extension -> (file dialog label, iter_pages(path, ingestor)), in registration order
+_EXTRACTORS = OrderedDict()
+
+
+def register_extractor(label, extensions, iter_pages):
+    """Add a document format.
+
+    `iter_pages(path, ingestor)` yields (page index, page count, text) in page
+    order; `ingestor` is the calling DocumentIngestor (for its process pool).
+    Import any heavy library inside `iter_pages` so it is only loaded once a
+    file of that format is actually opened.
+    """
+    for extension in extensions:
+        _EXTRACTORS[extension.lower()] = (label, iter_pages)
+
+
+def supported_extensions():
+    return list(_EXTRACTORS)
+
+
+def file_dialog_types():
+    """`filetypes` for tkinter's file dialogs covering every registered format."""
+    by_label = OrderedDict()
+    for extension, (label, _) in _EXTRACTORS.items():
+        by_label.setdefault(label, []).append(f"*{extension}")
+    everything = " ".join(f"*{extension}" for extension in _EXTRACTORS)
+    return [("All Supported", everything)] + [(label, " ".join(globs)) for label, globs in by_label.items()]
+
+
+def _read_text_file(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    try:
+        return data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return data.decode("cp1252", errors="replace")
+
+# PDFs shorter than this are read in the calling thread; a pool only pays off
+# once there are enough pages to amortize starting the worker processes
+_PARALLEL_MIN_PAGES = 16
+
+_worker_readers = OrderedDict()  # (path, mtime_ns) -> PdfReader, per worker process
+
+
+def _pdf_reader(path):
+    import PyPDF2
+
+    key = (path, os.stat(path).st_mtime_ns)
+    reader = _worker_readers.get(key)
+    if reader is None:
+        reader = _worker_readers[key] = PyPDF2.PdfReader(path)
+        while len(_worker_readers) > 2:
+            _worker_readers.popitem(last=False)
+    return reader
+
+
+def _extract_pdf_pages(path, start, stop):
+    reader = _pdf_reader(path)
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def _pdf_page_count(path):
+    import PyPDF2
+
+    with open(path, "rb") as f:
+        return len(PyPDF2.PdfReader(f).pages)
+
+
+def _iter_pdf_pages(path, ingestor):
+    total = _pdf_page_count(path)
+    if total < _PARALLEL_MIN_PAGES or ingestor.workers < 2:
+        reader = _pdf_reader(path)
+        for index in range(total):
+            yield index, total, reader.pages[index].extract_text() or ""
+        return
+    # Small ranges keep every worker busy and let early pages arrive first;
+    # the first range is read right here so it does not wait for the pool
+    # processes to start
+    step = max(1, min(8, total // (ingestor.workers * 4)))
+    executor = ingestor._ensure_executor()
+    futures = [
+        (start, executor.submit(_extract_pdf_pages, path, start, min(start + step, total)))
+        for start in range(step, total, step)
+    ]
+    try:
+        for index, text in enumerate(_extract_pdf_pages(path, 0, step)):
+            yield index, total, text
+        for start, future in futures:
+            for offset, text in enumerate(future.result()):
+                yield start + offset, total, text
+    finally:
+        for _, future in futures:
+            future.cancel()
+
+
+def _iter_txt_pages(path, ingestor):
+    with open(path, "r", encoding="utf-8") as f:
+        yield 0, 1, f.read()
+
+
+def _iter_docx_pages(path, ingestor):
+    import docx
+
+    document = docx.Document(path)
+    yield 0, 1, "\n".join(p.text for p in document.paragraphs)
+
+
+_ODF_TEXT = "{urn:oasis:names:tc:opendocument:xmlns:text:1.0}"
+
+
+def _odf_text(element):
+    parts = [element.text or ""]
+    for child in element:
+        if child.tag == _ODF_TEXT + "s":
+            parts.append(" " * int(child.get(_ODF_TEXT + "c", "1")))
+        elif child.tag == _ODF_TEXT + "tab":
+            parts.append("\t")
+        elif child.tag == _ODF_TEXT + "line-break":
+            parts.append("\n")
+        elif child.tag not in (_ODF_TEXT + "note", _ODF_TEXT + "p", _ODF_TEXT + "h"):
+            parts.append(_odf_text(child))
+        parts.append(child.tail or "")
+    return "".join(parts)
+
+
+def _odf_paragraphs(element):
+    for child in element:
+        if child.tag in (_ODF_TEXT + "p", _ODF_TEXT + "h"):
+            yield _odf_text(child)
+        elif child.tag != _ODF_TEXT + "note":
+            yield from _odf_paragraphs(child)
+
+
+def _iter_odt_pages(path, ingestor):
+    # An .odt is a zip whose content.xml holds the paragraphs and headings
+    with zipfile.ZipFile(path) as archive:
+        root = ET.fromstring(archive.read("content.xml"))
+    yield 0, 1, "\n".join(_odf_paragraphs(root))
+
+
+_RTF_TOKEN_RE = re.compile(r"\\([a-z]{1,32})(-?\d{1,10})? ?|\\'([0-9a-f]{2})|\\([^a-z])|([{}])|[\r\n]+|(.)", re.I | re.S)
+# Groups starting with these control words hold no document text
+_RTF_SKIPPED = frozenset((
+    "fonttbl", "colortbl", "stylesheet", "info", "pict", "object", "header", "headerl", "headerr",
+    "footer", "footerl", "footerr", "footnote", "fldinst", "themedata", "colorschememapping",
+    "datastore", "latentstyles", "listtable", "listoverridetable", "rsidtbl", "generator", "xmlnstbl",
+))
+_RTF_CHARS = {
+    "par": "\n", "line": "\n", "sect": "\n", "page": "\n", "row": "\n", "tab": "\t", "cell": " ",
+    "emdash": "\u2014", "endash": "\u2013", "bullet": "\u2022", "lquote": "\u2018",
+    "rquote": "\u2019", "ldblquote": "\u201c", "rdblquote": "\u201d",
+}
+
+
+def _rtf_to_text(rtf):
+    out = []
+    stack = []
+    ignorable = False
+    uc_skip = 1   # fallback characters that follow each \u escape
+    pending = 0
+    for match in _RTF_TOKEN_RE.finditer(rtf):
+        word, arg, hexcode, symbol, brace, char = match.groups()
+        if brace:
+            pending = 0
+            if brace == "{":
+                stack.append((uc_skip, ignorable))
+            elif stack:
+                uc_skip, ignorable = stack.pop()
+        elif symbol:
+            pending = 0
+            if symbol == "*":
+                ignorable = True
+            elif not ignorable and symbol in "\\{}":
+                out.append(symbol)
+            elif not ignorable and symbol == "~":
+                out.append("\u00a0")
+        elif word:
+            pending = 0
+            if word in _RTF_SKIPPED:
+                ignorable = True
+            elif ignorable:
+                continue
+            elif word == "uc":
+                uc_skip = int(arg or 1)
+            elif word == "u":
+                code = int(arg or 0)
+                out.append(chr(code + 65536 if code < 0 else code))
+                pending = uc_skip
+            elif word in _RTF_CHARS:
+                out.append(_RTF_CHARS[word])
+        elif hexcode or char:
+            if pending:
+                pending -= 1
+            elif not ignorable:
+                out.append(bytes([int(hexcode, 16)]).decode("cp1252", errors="replace") if hexcode else char)
+    return "".join(out)
+
+
+def _iter_rtf_pages(path, ingestor):
+    with open(path, "rb") as f:
+        yield 0, 1, _rtf_to_text(f.read().decode("cp1252", errors="replace"))
+
+
+class _HTMLText(HTMLParser):
+    BLOCKS = frozenset((
+        "p", "div", "br", "li", "tr", "h1", "h2", "h3", "h4", "h5", "h6", "section", "article",
+        "blockquote", "pre", "ul", "ol", "table", "header", "footer", "dt", "dd",
+    ))
+    SKIPPED = frozenset(("head", "script", "style", "template", "noscript"))
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skipping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIPPED:
+            self._skipping += 1
+        elif tag in self.BLOCKS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIPPED:
+            self._skipping = max(0, self._skipping - 1)
+        elif tag in self.BLOCKS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skipping:
+            self.parts.append(re.sub(r"\s+", " ", data))
+
+    def text(self):
+        lines = (line.strip() for line in "".join(self.parts).split("\n"))
+        return "\n".join(line for line in lines if line)
+
+
+def _html_to_text(markup):
+    parser = _HTMLText()
+    parser.feed(markup)
+    parser.close()
+    return parser.text()
+
+
+def _iter_html_pages(path, ingestor):
+    yield 0, 1, _html_to_text(_read_text_file(path))
+
+
+_MARKDOWN_RULES = [
+    (re.compile(r"^\s*(```|~~~).*$", re.M), ""),                 # code fences
+    (re.compile(r"!\[([^\]]*)\]\([^)]*\)"), r"\1"),              # images: keep alt text
+    (re.compile(r"\[([^\]]+)\]\([^)]*\)"), r"\1"),               # links: keep link text
+    (re.compile(r"^ {0,3}#{1,6}\s*|\s+#+\s*$", re.M), ""),          # heading markers
+    (re.compile(r"^ {0,3}>\s?", re.M), ""),                      # block quotes
+    (re.compile(r"^ {0,3}([-*_])(\s*\1){2,}\s*$", re.M), ""),     # horizontal rules
+    (re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+", re.M), ""),          # list markers
+    (re.compile(r"(?<![\w*_`])(\*\*|__|\*|_|`)(?=\S)(.+?)(?<=\S)\1(?![\w*_`])"), r"\2"),  # emphasis, code
+    (re.compile(r"<[^>\n]+>"), ""),                               # inline HTML
+]
+
+
+def _markdown_to_text(markdown):
+    for pattern, replacement in _MARKDOWN_RULES:
+        markdown = pattern.sub(replacement, markdown)
+    return markdown
+
+
+def _iter_markdown_pages(path, ingestor):
+    yield 0, 1, _markdown_to_text(_read_text_file(path))
+
+
+_CONTAINER_NS = "{urn:oasis:names:tc:opendocument:xmlns:container}"
+_OPF_NS = "{http://www.idpf.org/2007/opf}"
+
+
+def _iter_epub_pages(path, ingestor):
+    # Chapters are the XHTML files listed in the package's spine, in reading order
+    with zipfile.ZipFile(path) as archive:
+        container = ET.fromstring(archive.read("META-INF/container.xml"))
+        package_path = container.find(f".//{_CONTAINER_NS}rootfile").get("full-path")
+        package = ET.fromstring(archive.read(package_path))
+        manifest = {item.get("id"): item.get("href") for item in package.iter(_OPF_NS + "item")}
+        base = posixpath.dirname(package_path)
+        chapters = [
+            posixpath.normpath(posixpath.join(base, unquote(manifest[ref.get("idref")])))
+            for ref in package.iter(_OPF_NS + "itemref")
+            if ref.get("idref") in manifest
+        ]
+        for index, name in enumerate(chapters):
+            markup = archive.read(name).decode("utf-8", errors="replace")
+            yield index, len(chapters), _html_to_text(markup)
+
+
+register_extractor("Text Files", [".txt"], _iter_txt_pages)
+register_extractor("Word Documents", [".docx"], _iter_docx_pages)
+register_extractor("PDF Files", [".pdf"], _iter_pdf_pages)
+register_extractor("OpenDocument Text", [".odt"], _iter_odt_pages)
+register_extractor("Rich Text", [".rtf"], _iter_rtf_pages)
+register_extractor("Web Pages", [".html", ".htm"], _iter_html_pages)
+register_extractor("Markdown", [".md", ".markdown"], _iter_markdown_pages)
+register_extractor("EPUB Books", [".epub"], _iter_epub_pages)
+
+
+class DocumentIngestor:
+    """Extracts the text of documents in any registered format off the UI thread.
+
+    `ingest` runs on a background thread and reports each page's text in
+    document order as soon as it (and every page before it) is ready, so a
+    consumer can start on the first pages of a long PDF while later ones are
+    still being read. Long PDFs are split into page ranges extracted in
+    parallel by a pool of `workers` processes, kept for later documents.
+
+    With a `text_cache` (TextCache), a document read before is not parsed
+    again: its cached text is reported as a single page.
+    """
+
+    def __init__(self, workers=None, text_cache=None):
+        self.workers = max(1, int(workers or min(4, os.cpu_count() or 1)))
+        self.text_cache = text_cache
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def ingest(self, path, on_page=None, on_done=None, on_error=None):
+        """Extract `path` in the background; returns the thread.
+
+        Callbacks run on that thread: `on_page(index, total, text)` for each
+        non-empty page in order, then `on_done(text)` with the pages joined by
+        newlines (see `normalize_document_text`), or `on_error(exc)` if the
+        document cannot be read.
+        """
+        def run():
+            try:
+                # Plain text is cheaper to read again than to decompress
+                cache = None if path.lower().endswith(".txt") else self.text_cache
+                text = cache.get(path) if cache is not None else None
+                if text is not None:
+                    if on_page is not None:
+                        on_page(0, 1, text)
+                else:
+                    pages = []
+                    for index, total, page in self.iter_pages(path):
+                        if not page:
+                            continue
+                        pages.append(page)
+                        if on_page is not None:
+                            on_page(index, total, page)
+                    text = normalize_document_text("\n".join(pages))
+                    if cache is not None:
+                        cache.put(path, text)
+            except Exception as exc:
+                if on_error is not None:
+                    on_error(exc)
+                return
+            if on_done is not None:
+                on_done(text)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
+
+    def iter_pages(self, path):
+        """Yield (page index, page count, text) for `path` in page order."""
+        path = os.path.abspath(path)
+        extractor = _EXTRACTORS.get(os.path.splitext(path)[1].lower())
+        if extractor is None:
+            raise ValueError(f"Unsupported document type: {os.path.basename(path)}")
+        yield from extractor[1](path, self)
+
+    def _ensure_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
@@ -0,0 +1,263 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright (C) 2025 echoType
+
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+
+class GenerationCache:
+    """Content-addressed store of synthesized audio.
+
+    Entries are keyed by a hash of (text, voice model, length_scale), so
+    renaming a document still hits and editing it misses. The text is hashed
+    exactly as given: word-timing sidecars hold character offsets into it, so
+    even a whitespace change must miss. An index file keeps
+    sizes, last-use times and hit/miss counters; the least recently used entries
+    are evicted once the total size exceeds `max_bytes`.
+
+    Audio is kept as 16-bit FLAC. Small NumPy tables describing
+    the audio (sentence offsets, word timings) can be stored next to an entry as
+    `.npy` sidecars and share its lifetime.
+    """
+
+    INDEX_NAME = "index.json"
+
+    def __init__(self, cache_dir, max_bytes=2 * 1024 ** 3, extension=".flac", autosave=True):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = int(max_bytes)
+        self.extension = extension
+        # With autosave off, index changes are written only by `flush()`; used by
+        # caches that see many small lookups in a burst
+        self.autosave = autosave
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> {"file", "size", "last_used"}, oldest first
+        self._lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._load_index()
+
+    def make_key(self, text, model_path, length_scale, variant=None):
+        """`variant` tells apart audio of the same text rendered differently (e.g. normalized)."""
+        model_id = os.path.basename(str(model_path))
+        try:
+            model_id += f":{os.path.getsize(model_path)}"
+        except OSError:
+            pass
+        payload = "\0".join([
+            text or "",
+            model_id,
+            f"{float(length_scale):.4f}",
+        ] + ([variant] if variant else []))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path_for(self, key):
+        return self.cache_dir / f"{key}{self.extension}"
+
+    def lookup(self, key):
+        """Return the cached file for `key` (marking it recently used) or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            path = self.cache_dir / entry["file"] if entry else None
+            if path is not None and path.is_file():
+                self.hits += 1
+                entry["last_used"] = time.time()
+                self._entries.move_to_end(key)
+                self._index_changed_locked()
+                return path
+            if entry is not None:
+                self._entries.pop(key, None)
+                for name in entry.get("sidecars", []):
+                    self._unlink(name)
+            self.misses += 1
+            self._index_changed_locked()
+            return None
+
+    def discard(self, key):
+        """Forget `key` and delete its files, e.g. after finding the entry unreadable."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return
+            for name in [entry["file"]] + entry.get("sidecars", []):
+                self._unlink(name)
+            self._index_changed_locked()
+
+    def contains(self, key):
+        """True if `key` is cached; unlike `lookup` this does not count as a use."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (self.cache_dir / entry["file"]).is_file()
+
+    def store(self, key, writer, sidecars=None):
+        """Call `writer(path)` to produce the entry for `key`, then evict as needed.
+
+        `sidecars` maps names to arrays saved alongside; see `load_sidecars`.
+        """
+        final_path = self.path_for(key)
+        # Keep the real extension last so writers can infer the file format
+        tmp_path = self.cache_dir / f"{key}.partial{self.extension}"
+        try:
+            writer(tmp_path)
+            os.replace(tmp_path, final_path)
+        except Exception:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            raise
+        sidecar_files = []
+        for name, table in (sidecars or {}).items():
+            if table is None:
+                continue
+            path = self.cache_dir / f"{key}.{name}.npy"
+            tmp_path = self.cache_dir / f"{key}.{name}.partial.npy"
+            try:
+                with open(tmp_path, "wb") as f:
+                    np.save(f, np.asarray(table), allow_pickle=False)
+                os.replace(tmp_path, path)
+            except (OSError, ValueError):
+                try:
+                    tmp_path.unlink()
+                except OSError:
+                    pass
+                continue
+            sidecar_files.append(path.name)
+        size = final_path.stat().st_size
+        size += sum((self.cache_dir / name).stat().st_size for name in sidecar_files)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            for name in (previous or {}).get("sidecars", []):
+                if name not in sidecar_files:
+                    self._unlink(name)
+            self._entries[key] = {
+                "file": final_path.name,
+                "size": size,
+                "sidecars": sidecar_files,
+                "last_used": time.time(),
+            }
+            self._evict_locked(keep=key)
+            self._index_changed_locked()
+        return final_path
+
+    def import_file(self, key, source):
+        """Adopt an audio file written outside the index (by older versions) as `key`.
+
+        The file is re-encoded in the current format and deleted; if `key` is
+        already cached it is only deleted. Files the index refers to are left
+        alone. Returns the entry's path, or None if the file could not be read.
+        """
+        source = Path(source)
+        with self._lock:
+            if source.parent.resolve() == self.cache_dir.resolve() and any(
+                entry["file"] == source.name for entry in self._entries.values()
+            ):
+                return None
+        if not self.contains(key):
+            def writer(path):
+                pcm, sample_rate = sf.read(str(source), dtype="int16")
+                if pcm.ndim > 1:
+                    pcm = pcm.mean(axis=1).astype(np.int16)
+                sf.write(str(path), pcm, sample_rate, subtype="PCM_16")
+
+            try:
+                self.store(key, writer)
+            except Exception:
+                return None
+        try:
+            source.unlink()
+        except OSError:
+            pass
+        return self.path_for(key)
+
+    def load_sidecars(self, key):
+        """Return {name: array} for the tables stored with `key` (empty if none)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            names = list(entry.get("sidecars", [])) if entry else []
+        tables = {}
+        prefix = f"{key}."
+        for filename in names:
+            try:
+                tables[filename[len(prefix):-len(".npy")]] = np.load(self.cache_dir / filename, allow_pickle=False)
+            except (OSError, ValueError):
+                continue
+        return tables
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": sum(e["size"] for e in self._entries.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _evict_locked(self, keep=None):
+        total = sum(e["size"] for e in self._entries.values())
+        for key in list(self._entries):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            entry = self._entries.pop(key)
+            total -= entry["size"]
+            for name in [entry["file"]] + entry.get("sidecars", []):
+                self._unlink(name)
+
+    def _unlink(self, filename):
+        try:
+            (self.cache_dir / filename).unlink()
+        except OSError:
+            pass
+
+    def _load_index(self):
+        index_path = self.cache_dir / self.INDEX_NAME
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.hits = int(data.get("hits", 0))
+        self.misses = int(data.get("misses", 0))
+        entries = data.get("entries", {})
+        for key, entry in sorted(entries.items(), key=lambda kv: kv[1].get("last_used", 0)):
+            if (self.cache_dir / entry.get("file", "")).is_file():
+                self._entries[key] = entry
+
+    def flush(self):
+        """Write pending index changes (only needed with autosave off)."""
+        with self._lock:
+            if self._dirty:
+                self._save_index_locked()
+
+    def _index_changed_locked(self):
+        if self.autosave:
+            self._save_index_locked()
+        else:
+            self._dirty = True
+
+    def _save_index_locked(self):
+        index_path = self.cache_dir / self.INDEX_NAME
+        tmp_path = index_path.with_suffix(".tmp")
+        payload = {
+            "version": 2,
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": dict(self._entries),
+        }
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, index_path)
+            self._dirty = False
+        except OSError:
+            pass
@@ -19,6 +19,7 @@ if sys.platform == "win32":
 
 
 import atexit
+import multiprocessing
 import signal
 from pathlib import Path
 import tkinter as tk
@@ -62,6 +63,8 @@ def _set_app_icon(root: tk.Tk) -> None:
             pass
 
 if __name__ == "__main__":
+    # Synthesis worker processes re-enter here in frozen builds
+    multiprocessing.freeze_support()
     root = tk.Tk()
     _set_app_icon(root)
     try:
@@ -0,0 +1,125 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright (C) 2025 echoType
+
+import shutil
+import time
+
+from tts_manager import TTSManager
+from tts_scheduler import SPECULATIVE
+
+
+class SpeculativeSynthesizer:
+    """Pre-synthesizes likely next variants of the loaded document while the app is idle.
+
+    A variant is a (cache key, voice model, UI speed) the admin may switch to
+    next. Variants are synthesized most likely first as low-priority scheduler
+    jobs into the generation cache, with a non-streaming TTSManager of their own
+    (sharing the foreground voice pool), so the switch itself becomes a cache
+    hit. Work waits while `is_idle()` is False, is paced to about
+    `cpu_percent` of one core, and stops once speculative entries would take
+    more than `max_bytes` or leave less than `MIN_FREE_BYTES` on the disk.
+    """
+
+    # Upper bound on 16-bit PCM bytes per character of text at length_scale 1.0
+    # (about 14 characters per second of 22.05 kHz audio, before FLAC)
+    BYTES_PER_CHAR = 3200
+    MIN_FREE_BYTES = 1024 ** 3
+
+    def __init__(self, generation_cache, foreground, scheduler, is_idle, cpu_percent=50,
+                 max_bytes=512 * 1024 ** 2):
+        self.generation_cache = generation_cache
+        self.foreground = foreground
+        self.scheduler = scheduler
+        self.is_idle = is_idle
+        self.cpu_percent = min(100.0, max(1.0, float(cpu_percent)))
+        self.max_bytes = int(max_bytes)
+        self._stored = {}  # cache key -> bytes, for entries written speculatively
+        self._manager = None
+        self._jobs = []
+        self._tick = 0.0
+
+    def schedule(self, text, variants):
+        """Replace any pending work with `variants` of `text`, most likely first.
+
+        Each variant becomes a SPECULATIVE job on `scheduler`, keyed by its cache
+        key and returning the cached path. A foreground request for the same
+        audio cancels it and synthesizes with the foreground manager instead.
+        """
+        self.cancel()
+        if not text.strip():
+            return
+        for key, model_name, speed in variants:
+            self._jobs.append(self.scheduler.submit(
+                lambda job, key=key, model_name=model_name, speed=speed: self._run(job, text, key, model_name, speed),
+                key=key,
+                priority=SPECULATIVE
+            ))
+
+    def cancel(self):
+        """Abandon the current variant and anything still queued."""
+        jobs, self._jobs = self._jobs, []
+        for job in jobs:
+            job.cancel()
+
+    def close(self):
+        self.cancel()
+        if self._manager is not None:
+            self._manager.close()
+            self._manager = None
+
+    def speculative_bytes(self):
+        """Bytes of speculatively synthesized entries still in the cache."""
+        return sum(size for key, size in list(self._stored.items()) if self.generation_cache.contains(key))
+
+    def _run(self, job, text, key, model_name, speed):
+        if self.generation_cache.contains(key):
+            return self.generation_cache.path_for(key)
+        scale = self.foreground.synth_scale_for(speed)
+        estimate = int(len(text) * self.BYTES_PER_CHAR * scale)
+        if self.speculative_bytes() + estimate > self.max_bytes:
+            return None
+        try:
+            if shutil.disk_usage(self.generation_cache.cache_dir).free - estimate < self.MIN_FREE_BYTES:
+                return None
+        except OSError:
+            return None
+        if not self._wait_idle(job):
+            return None
+        manager = self._manager_for(model_name)
+        self._tick = time.monotonic()
+        if not manager.TTSGenerate(text, length_scale=scale, pace=lambda: self._pace(job)):
+            return None
+        path = self.generation_cache.store(key, manager.save_audio, sidecars=manager.timings)
+        self._stored[key] = path.stat().st_size
+        return path
+
+    def _manager_for(self, model_name):
+        if self._manager is None:
+            fg = self.foreground
+            self._manager = TTSManager(
+                voices_dir=fg.voices_dir,
+                model_basename=model_name,
+                piper_length_scale=fg.piper_length_scale,
+                use_synth_speed=fg.use_synth_speed,
+                invert_ui_speed=fg.invert_ui_speed,
+                stream_synthesis=False,
+                speed_mode=fg.speed_mode,
+                voice_pool=fg.voice_pool,
+                text_normalizer=fg.text_normalizer
+            )
+        else:
+            self._manager.set_voice_model(model_name)
+        return self._manager
+
+    def _pace(self, job):
+        # Sleep long enough that synthesis averages `cpu_percent` of one core
+        busy = time.monotonic() - self._tick
+        idle = busy * (100.0 / self.cpu_percent - 1.0)
+        ok = not job.wait_cancelled(idle) and self._wait_idle(job)
+        self._tick = time.monotonic()
+        return ok
+
+    def _wait_idle(self, job):
+        while not job.cancelled and not self.is_idle():
+            job.wait_cancelled(0.5)
+        return job.checkpoint()
@@ -0,0 +1,38 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright (C) 2025 echoType
+
+import unittest
+
+from text_normalizer import TextNormalizer
+
+
+class RoadAbbreviationTests(unittest.TestCase):
+    def setUp(self):
+        self.normalizer = TextNormalizer()
+
+    def spoken(self, text):
+        return self.normalizer.normalize(text).text
+
+    def test_street_before_next_sentence(self):
+        self.assertEqual(self.spoken("I live at 123 Main St. The house is blue."),
+                         "I live at one hundred twenty-three Main Street. The house is blue.")
+
+    def test_title_at_start_is_kept(self):
+        self.assertEqual(self.spoken("Dr. Smith will see you."), "Dr. Smith will see you.")
+
+    def test_drive_after_street_name(self):
+        self.assertEqual(self.spoken("Turn onto 15 Oak Dr. today."), "Turn onto fifteen Oak Drive today.")
+        self.assertEqual(self.spoken("It is at 15 Oak Dr."), "It is at fifteen Oak Drive.")
+
+    def test_title_after_house_number(self):
+        self.assertEqual(self.spoken("Room 15 Dr. Martin is in."), "Room fifteen Dr. Martin is in.")
+
+    def test_saint_is_kept(self):
+        self.assertEqual(self.spoken("We flew to St. Louis."), "We flew to St. Louis.")
+
+    def test_matching_expands_everywhere(self):
+        self.assertEqual(self.normalizer.matching_words("Dr. Smith"), ["drive", "smith"])
+
+
+if __name__ == "__main__":
+    unittest.main()
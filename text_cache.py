@@ -0,0 +1,61 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright (C) 2025 echoType
+
+import lzma
+import unicodedata
+
+from document_identity import DocumentIdentity
+from generation_cache import GenerationCache
+
+
+def normalize_document_text(text):
+    """NFC, `\\n` line endings and no trailing whitespace on lines."""
+    text = unicodedata.normalize("NFC", text or "").replace("\r\n", "\n").replace("\r", "\n")
+    return "\n".join(line.rstrip() for line in text.split("\n")).strip("\n")
+
+
+class TextCache:
+    """Extracted document text, so reopening a .docx/.pdf skips parsing it.
+
+    Text is stored LZMA-compressed under the source file's content key from
+    `identity` (a DocumentIdentity), which memoizes it by (inode, size, mtime):
+    a repeat load of an unchanged file costs one `stat`, and a file whose stat
+    changed (copied, touched, synced) is re-hashed and still hits if its
+    content is the same. The index and LRU eviction past `max_bytes` are
+    those of GenerationCache.
+    """
+
+    EXTENSION = ".txt.xz"
+
+    def __init__(self, cache_dir, max_bytes=64 * 1024 ** 2, identity=None):
+        self.identity = identity or DocumentIdentity()
+        self.store = GenerationCache(cache_dir, max_bytes=max_bytes, extension=self.EXTENSION)
+
+    def get(self, path):
+        """Return the cached text for the document at `path`, or None."""
+        content_hash = self.identity.key_for(path)
+        file_path = self.store.lookup(content_hash)
+        if file_path is None:
+            return None
+        try:
+            with lzma.open(file_path, "rt", encoding="utf-8") as f:
+                return f.read()
+        except (OSError, lzma.LZMAError, UnicodeDecodeError):
+            self.store.discard(content_hash)
+            return None
+
+    def put(self, path, text):
+        """Remember `text` as the extracted text of the document at `path`."""
+        content_hash = self.identity.key_for(path)
+
+        def writer(file_path):
+            with lzma.open(file_path, "wt", encoding="utf-8") as f:
+                f.write(text)
+
+        try:
+            self.store.store(content_hash, writer)
+        except OSError:
+            pass
+
+    def stats(self):
+        return self.store.stats()
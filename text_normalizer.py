@@ -0,0 +1,421 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright (C) 2025 echoType
+
+import re
+from bisect import bisect_right
+
+ROAD_VARIATIONS = {
+    "street": ["street", "st", "st."],
+    "avenue": ["avenue", "ave", "ave."],
+    "road": ["road", "rd", "rd."],
+    "boulevard": ["boulevard", "blvd", "blvd."],
+    "drive": ["drive", "dr", "dr."],
+    "lane": ["lane", "ln", "ln."],
+    "court": ["court", "ct", "ct."],
+    "terrace": ["terrace", "ter", "ter.", "terr"],
+    "place": ["place", "pl", "pl."],
+    "square": ["square", "sq", "sq."],
+    "highway": ["highway", "hwy", "hwy."],
+    "parkway": ["parkway", "pkwy", "pkwy."],
+    "circle": ["circle", "cir", "cir."],
+    "trail": ["trail", "trl", "trl."],
+    "way": ["way", "wy", "wy."]
+}
+
+# Abbreviations that are also titles ("Dr. Martin", "St. Louis")
+TITLE_ABBREVIATIONS = frozenset({"dr", "st"})
+
+# A four-digit number is read as a year only after one of these words,
+# in parentheses or before an era ("in 1995", "(1995)", "1066 AD")
+YEAR_CONTEXT_WORDS = frozenset({
+    "in", "since", "until", "till", "from", "to", "between", "during", "before", "after", "circa", "year",
+})
+
+# Numbers read digit by digit however they are written
+DIGIT_CODES = frozenset({"911"})
+
+MONTHS = [
+    "january", "february", "march", "april", "may", "june",
+    "july", "august", "september", "october", "november", "december",
+]
+
+_ONES = [
+    "zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten",
+    "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen", "seventeen", "eighteen", "nineteen",
+]
+_TENS = ["", "", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety"]
+_SCALES = ["", "thousand", "million", "billion", "trillion"]
+_ORDINAL_WORDS = {
+    "one": "first", "two": "second", "three": "third", "five": "fifth",
+    "eight": "eighth", "nine": "ninth", "twelve": "twelfth",
+}
+
+
+def _below_thousand(n):
+    words = []
+    if n >= 100:
+        words += [_ONES[n // 100], "hundred"]
+        n %= 100
+    if n >= 20:
+        words.append(_TENS[n // 10] + (f"-{_ONES[n % 10]}" if n % 10 else ""))
+    elif n or not words:
+        words.append(_ONES[n])
+    return " ".join(words)
+
+
+def number_to_words(n):
+    """English cardinal for a non-negative int; digit by digit past the trillions."""
+    if n >= 1000 ** len(_SCALES):
+        return digits_to_words(str(n))
+    if n < 1000:
+        return _below_thousand(n)
+    groups = []
+    scale = 0
+    while n:
+        n, group = divmod(n, 1000)
+        if group:
+            groups.append(_below_thousand(group) + (f" {_SCALES[scale]}" if scale else ""))
+        scale += 1
+    return " ".join(reversed(groups))
+
+
+def ordinal_words(n):
+    words = number_to_words(n)
+    head, sep, last = words.rpartition(" ")
+    stem, dash, unit = last.rpartition("-")
+    if unit in _ORDINAL_WORDS:
+        unit = _ORDINAL_WORDS[unit]
+    elif unit.endswith("y"):
+        unit = unit[:-1] + "ieth"
+    else:
+        unit += "th"
+    return head + sep + stem + dash + unit
+
+
+def year_words(n):
+    """Years the way they are spoken: 1995 -> nineteen ninety-five, 2005 -> two thousand five."""
+    if not 1100 <= n <= 2099 or 2000 <= n <= 2009:
+        return number_to_words(n)
+    century, rest = divmod(n, 100)
+    if rest == 0:
+        return f"{number_to_words(century)} hundred"
+    if rest < 10:
+        return f"{number_to_words(century)} oh {_ONES[rest]}"
+    return f"{number_to_words(century)} {number_to_words(rest)}"
+
+
+def digits_to_words(digits):
+    return " ".join(_ONES[int(d)] for d in digits if d.isdigit())
+
+
+class _Trie:
+    """Case-insensitive longest-prefix lookup of fixed phrases."""
+
+    _END = object()
+
+    def __init__(self):
+        self.root = {}
+
+    def add(self, phrase, value):
+        node = self.root
+        for char in phrase.lower():
+            node = node.setdefault(char, {})
+        node[self._END] = value
+
+    def prefixes(self, length, node=None):
+        """Every distinct start of a phrase, up to `length` characters."""
+        node = self.root if node is None else node
+        found = []
+        for char, child in node.items():
+            if char is self._END:
+                continue
+            tails = self.prefixes(length - 1, child) if length > 1 else []
+            if not tails or self._END in child:
+                found.append(char)
+            found.extend(char + tail for tail in tails)
+        return found
+
+    def longest(self, text, pos):
+        """(end, value) of the longest phrase starting at `pos` that ends on a word boundary."""
+        node = self.root
+        best = None
+        for i in range(pos, len(text)):
+            node = node.get(text[i].lower())
+            if node is None:
+                break
+            if self._END in node and (i + 1 == len(text) or not text[i + 1].isalnum() or text[i] == "."):
+                best = (i + 1, node[self._END])
+        return best
+
+
+class NormalizedText:
+    """Normalized text plus the source span each replaced piece came from.
+
+    `spans` holds (out_start, out_end, src_start, src_end) per replacement, in
+    order; text between replacements is unchanged, so offsets there map by a
+    constant shift.
+    """
+
+    def __init__(self, source, text, spans):
+        self.source = source
+        self.text = text
+        self.spans = spans
+        self._out_starts = [span[0] for span in spans]
+
+    def __str__(self):
+        return self.text
+
+    def to_source(self, offset, end=False):
+        """Offset in `source` of `offset` in `text`; a range end (`end=True`) inside
+        a replacement maps to the end of what it replaced, a start to its start."""
+        index = bisect_right(self._out_starts, offset - 1 if end else offset) - 1
+        if index < 0:
+            return offset
+        out_start, out_end, src_start, src_end = self.spans[index]
+        if offset < out_end or (end and offset == out_end):
+            return src_end if end else src_start
+        return offset - out_end + src_end
+
+    def source_span(self, start, end):
+        return self.to_source(start), self.to_source(end, end=True)
+
+
+_PHONE = r"(?:(?:\+?1[ .-]?)?(?:\(\d{3}\)[ ]?|\d{3}[ .-])\d{3}[ .-]\d{4}|\d{3}-\d{4})"
+_DAY = r"\s+(\d{1,2})(?:st|nd|rd|th)?(?:,?\s+(\d{4}))?(?!\w)"
+_ERA = r"\s*(?:B\.?C\.?(?:E\.?)?|A\.?D\.?|C\.?E\.?)(?!\w)"
+# Every token starts a word; the lookahead rejects most positions before the alternatives are tried
+_TOKEN_RE_TEMPLATE = r"""
+    (?<![\w'])(?=[\d$(+FIRST])
+    (?:
+    (?P<phone>(?<![\w.+(])""" + _PHONE + r"""(?![\w-]))
+  | (?P<iso>(?<![\w./-])(\d{4})-(\d{2})-(\d{2})(?![\w/-]))
+  | (?P<mdy>(?<![\w./-])(\d{1,2})/(\d{1,2})/(\d{4}|\d{2})(?![\w/]))
+  | (?P<time>(?<![\w.:])(\d{1,2}):(\d{2})(?:\s?([ap])\.?m\b\.?)?(?![\w:]))
+  | (?P<money>(?<![\w.,])\$(\d{1,3}(?:,\d{3})+|\d+)(?:\.(\d{2}))?(?![\w]|[.,]\d))
+  | (?P<ordinal>(?<![\w.,])(\d+)(?:st|nd|rd|th)(?!\w))
+  | (?P<number>(?<![\w.,])(\d{1,3}(?:,\d{3})+|\d+)(?:\.(\d+))?(%)?(?![\w]|[.,]\d))
+  | (?P<word>(?:PREFIXES))
+    )
+"""
+
+
+class TextNormalizer:
+    """Spells out numbers, dates, times, phone numbers and road abbreviations in one pass.
+
+    A single compiled pattern finds numeric tokens and the starts of words
+    that begin a known phrase; those phrases (abbreviations from
+    `abbreviations`, month names) are resolved with a character trie, so a
+    document is scanned once whatever the size of the tables. Tables are built
+    when the normalizer is created and reused for every call.
+
+    `normalize` produces the text Piper reads, with a span map back to the
+    original; `matching_words` applies the same tables to text being graded.
+    """
+
+    # Bump when the output changes so audio cached from older output is not reused
+    VERSION = 2
+    language = "en"
+
+    def __init__(self, abbreviations=ROAD_VARIATIONS):
+        self._trie = _Trie()
+        self._roads = {}
+        for canonical, variants in abbreviations.items():
+            for variant in variants:
+                if variant.lower() != canonical:
+                    self._trie.add(variant, ("road", canonical))
+                self._roads[variant.lower().rstrip(".")] = canonical
+        for number, month in enumerate(MONTHS, start=1):
+            for variant in (month, month[:3], month[:3] + ".", "sept", "sept."):
+                if variant.startswith(month[:3]):
+                    self._trie.add(variant, ("month", number))
+        # Only words starting like a known phrase reach the trie
+        prefixes = "|".join(sorted(map(re.escape, self._trie.prefixes(2)), key=len, reverse=True))
+        first = re.escape("".join(sorted({prefix[0] for prefix in self._trie.prefixes(1)})))
+        self._token_re = re.compile(
+            _TOKEN_RE_TEMPLATE.replace("PREFIXES", prefixes).replace("FIRST", first), re.X | re.I
+        )
+        self._day_re = re.compile(_DAY)
+        self._era_re = re.compile(_ERA)
+        self._matching_re = re.compile(r"[^\w\s]")
+
+    def applies_to(self, model_path):
+        """Whether text for the Piper voice at `model_path` should be normalized."""
+        return re.split(r"[\\/]", str(model_path))[-1].lower().startswith(self.language)
+
+    def normalize(self, text, for_matching=False):
+        """Return a NormalizedText of `text`.
+
+        Road abbreviations are only expanded after a capitalized word or a
+        number ("Main St.", "5th Ave") so titles like "Dr. Smith" are left
+        alone, as is "Dr." or "St." between a house number and a name
+        ("15 Dr. Martin"); `for_matching` expands them everywhere.
+        """
+        text = text or ""
+        out = []
+        spans = []
+        out_len = 0
+        cursor = 0
+        pos = 0
+        while True:
+            match = self._token_re.search(text, pos)
+            if match is None:
+                break
+            result = self._expand(text, match, for_matching)
+            if result is None:
+                # Not a phrase we know: skip the rest of this word
+                pos = match.end()
+                while pos < len(text) and text[pos].isalnum():
+                    pos += 1
+                continue
+            end, spoken = result
+            # Keep a period the replaced text shared with the end of its sentence
+            if text[end - 1] == "." and self._ends_sentence(text, end):
+                spoken += "."
+            start = match.start()
+            piece = text[cursor:start]
+            out.append(piece)
+            out_len += len(piece)
+            out.append(spoken)
+            spans.append((out_len, out_len + len(spoken), start, end))
+            out_len += len(spoken)
+            cursor = pos = end
+        out.append(text[cursor:])
+        return NormalizedText(text, "".join(out), spans)
+
+    def matching_words(self, text, expand=True):
+        """Lowercase words of `text` with the same expansions, punctuation removed.
+
+        With `expand=False`, for text no normalized voice reads, only road
+        abbreviations are mapped to their full names.
+        """
+        if not expand:
+            words = self._matching_re.sub(" ", text or "").lower().split()
+            return [self._roads.get(word, word) for word in words]
+        normalized = self.normalize(text, for_matching=True).text
+        return self._matching_re.sub(" ", normalized).lower().split()
+
+    def _expand(self, text, match, for_matching):
+        kind = match.lastgroup
+        groups = match.groups()
+        index = match.re.groupindex[kind]
+        if kind == "phone":
+            digits = re.sub(r"\D", "", match.group())
+            parts = [digits[:-10], digits[-10:-7], digits[-7:-4], digits[-4:]]
+            return match.end(), ", ".join(digits_to_words(part) for part in parts if part)
+        if kind == "iso":
+            year, month, day = groups[index:index + 3]
+            return self._date(match.end(), int(month), int(day), int(year))
+        if kind == "mdy":
+            month, day, year = groups[index:index + 3]
+            year = int(year)
+            if len(groups[index + 2]) == 2:
+                year += 2000 if year < 50 else 1900
+            return self._date(match.end(), int(month), int(day), year)
+        if kind == "time":
+            hour, minute, meridiem = groups[index:index + 3]
+            hour, minute = int(hour), int(minute)
+            if hour > 23 or minute > 59:
+                return None
+            spoken = number_to_words(hour)
+            if minute:
+                spoken += f" oh {_ONES[minute]}" if minute < 10 else f" {number_to_words(minute)}"
+            elif not meridiem:
+                spoken += " hundred" if hour > 12 else " o'clock"
+            if meridiem:
+                spoken += f" {meridiem.lower()} m"
+            return match.end(), spoken
+        if kind == "money":
+            dollars, cents = groups[index:index + 2]
+            dollars = int(dollars.replace(",", ""))
+            spoken = f"{number_to_words(dollars)} dollar{'' if dollars == 1 else 's'}"
+            if cents and int(cents):
+                spoken += f" and {number_to_words(int(cents))} cent{'' if int(cents) == 1 else 's'}"
+            return match.end(), spoken
+        if kind == "ordinal":
+            return match.end(), ordinal_words(int(groups[index]))
+        if kind == "number":
+            whole, fraction, percent = groups[index:index + 3]
+            value = int(whole.replace(",", ""))
+            if "," in whole or fraction or percent:
+                spoken = number_to_words(value)
+            elif whole in DIGIT_CODES or whole[0] == "0" and len(whole) > 1 or len(whole) > 7:
+                spoken = digits_to_words(whole)  # codes, zero-padded numbers and long digit strings
+            elif len(whole) == 4 and self._in_year_context(text, match.start(), match.end()):
+                spoken = year_words(value)
+            else:
+                spoken = number_to_words(value)
+            if fraction:
+                spoken += " point " + digits_to_words(fraction)
+            if percent:
+                spoken += " percent"
+            return match.end(), spoken
+        found = self._trie.longest(text, match.start())
+        if found is None:
+            return None
+        end, (category, value) = found
+        if category == "month":
+            day = self._day_re.match(text, end)
+            if day is None or not 1 <= int(day.group(1)) <= 31:
+                return None
+            spoken = f"{MONTHS[value - 1].capitalize()} {ordinal_words(int(day.group(1)))}"
+            if day.group(2):
+                spoken += f", {year_words(int(day.group(2)))}"
+            return day.end(), spoken
+        if not for_matching and (not self._follows_name(text, match.start())
+                                 or self._is_title(text, match.start(), end)):
+            return None
+        return end, value.capitalize() if text[match.start()].isupper() else value
+
+    def _date(self, end, month, day, year):
+        if not (1 <= month <= 12 and 1 <= day <= 31):
+            return None
+        return end, f"{MONTHS[month - 1].capitalize()} {ordinal_words(day)}, {year_words(year)}"
+
+    def _in_year_context(self, text, start, end):
+        if self._previous_word(text, start).lower() in YEAR_CONTEXT_WORDS:
+            return True
+        if text[start - 1:start] == "(" and text[end:end + 1] == ")":
+            return True
+        return self._era_re.match(text, end) is not None
+
+    @staticmethod
+    def _previous_word(text, pos):
+        """The word before `pos`, separated from it by spaces on the same line, else ""."""
+        i = pos - 1
+        while i >= 0 and text[i] in " \t":
+            i -= 1
+        end = i + 1
+        while i >= 0 and (text[i].isalnum() or text[i] in "'-"):
+            i -= 1
+        return text[i + 1:end] if end < pos else ""
+
+    @classmethod
+    def _follows_name(cls, text, pos):
+        """True if the word before `pos` (on the same line) is capitalized or numeric."""
+        word = cls._previous_word(text, pos)
+        return bool(word) and (word[0].isupper() or word[0].isdigit())
+
+    @classmethod
+    def _is_title(cls, text, start, end):
+        """True for "Dr." or "St." after a house number and before a capitalized word.
+
+        A road needs a name ("15 Oak Dr.", "Main St. The..."), so a title is only
+        assumed when the abbreviation follows a bare number and a name follows it
+        ("15 Dr. Martin").
+        """
+        if text[end - 1] != "." or text[start:end - 1].lower() not in TITLE_ABBREVIATIONS:
+            return False
+        if not cls._previous_word(text, start).isdigit():
+            return False
+        i = end
+        while i < len(text) and text[i] in " \t":
+            i += 1
+        return i > end and i < len(text) and text[i].isupper()
+
+    @staticmethod
+    def _ends_sentence(text, end):
+        """True if an abbreviation's period at `end` also closes a sentence."""
+        i = end
+        while i < len(text) and text[i] in " \t":
+            i += 1
+        return i == len(text) or text[i] == "\n" or (i > end and text[i].isupper())
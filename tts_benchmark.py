@@ -0,0 +1,132 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright (C) 2025 echoType
+
+"""Synthesis benchmarks for TTSManager.
+
+Real-time factor (RTF) is synthesis wall time divided by the length of the
+audio produced; lower is better and anything under 1.0 is faster than
+real time. Examples:
+
+    python tts_benchmark.py --text "examples/español example 1.txt" --workers 1,2,4,8
+    python tts_benchmark.py --pipeline-minutes 10
+
+The second form times the post-synthesis load pipeline (int16 PCM to playable
+float32) against the copy-per-stage version it replaced, per minute of audio.
+"""
+
+import argparse
+import os
+import time
+import tracemalloc
+
+import numpy as np
+
+from tts_manager import _SOFTEN_GAIN, TTSManager, soften_pcm
+
+SAMPLE_TEXT = (
+    "Caller reports a two vehicle collision at the corner of Main Street and Fifth Avenue. "
+    "One driver is trapped and the other is walking around the scene. "
+    "There is fluid leaking from the engine of the blue sedan. "
+    "The caller can see smoke but no visible flames at this time. "
+    "Traffic is backing up in both directions on Main Street. "
+    "A bystander is directing cars around the wreck with a flashlight. "
+) * 6
+
+
+def bench_workers(text, model_basename, worker_counts, repeats=1, voices_dir=None):
+    rows = []
+    for workers in worker_counts:
+        manager = TTSManager(
+            voices_dir=voices_dir,
+            model_basename=model_basename,
+            stream_synthesis=False,
+            synthesis_workers=workers
+        )
+        try:
+            # Warm-up pays the one-off model load(s) so only steady-state synthesis is timed
+            manager.TTSGenerate(text[:200])
+            best = None
+            for _ in range(max(1, repeats)):
+                start = time.perf_counter()
+                manager.TTSGenerate(text)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            audio_seconds = manager.getTTSDuration()
+        finally:
+            manager.close()
+        rows.append((workers, best, audio_seconds, best / audio_seconds if audio_seconds else float("nan")))
+    return rows
+
+
+def _legacy_prepare(pcm):
+    # load_audio before the in-place pipeline, kept as the comparison baseline.
+    # It used to normalize to the audio's peak first; that is now the same fixed
+    # gain soften_pcm applies, so both produce the same audio from the same work
+    data = pcm.astype(np.float32) / 32768.0
+    softened = np.tanh(data * _SOFTEN_GAIN)
+    data = np.convolve(softened, np.array([0.2, 0.6, 0.2], dtype=np.float32), mode="same")
+    clean = data.copy()
+    return clean, data.astype(np.float32)
+
+
+def _staged_prepare(pcm):
+    clean = soften_pcm(pcm)
+    return clean, clean
+
+
+def bench_load_pipeline(minutes=10.0, repeats=3, sample_rate=22050):
+    """Return (name, seconds per audio minute, peak MB allocated per audio minute) rows."""
+    n = int(minutes * 60 * sample_rate)
+    t = np.arange(n, dtype=np.float32) / sample_rate
+    pcm = (np.sin(2 * np.pi * 180.0 * t) * np.sin(2 * np.pi * 0.3 * t) * 20000).astype(np.int16)
+    del t
+    rows = []
+    for name, prepare in (("copy per stage", _legacy_prepare), ("in place", _staged_prepare)):
+        best = None
+        for _ in range(max(1, repeats)):
+            start = time.perf_counter()
+            prepare(pcm)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        tracemalloc.start()
+        prepare(pcm)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        rows.append((name, best / minutes, peak / (1024 * 1024) / minutes))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--text", help="UTF-8 text file to synthesize (defaults to a built-in passage)")
+    parser.add_argument("--voice", default="en_US-libritts-high.onnx", help="Voice model in voices/")
+    parser.add_argument("--voices-dir", help="Folder holding the voice models (defaults to ./voices)")
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts to compare")
+    parser.add_argument("--repeats", type=int, default=1, help="Timed runs per worker count (best is kept)")
+    parser.add_argument("--pipeline-minutes", type=float,
+                        help="Benchmark the audio load pipeline on this many minutes of audio instead")
+    args = parser.parse_args()
+
+    if args.pipeline_minutes:
+        print(f"load pipeline, {args.pipeline_minutes:g} min of 22.05 kHz audio")
+        print(f"{'pipeline':>14}  {'ms/min':>7}  {'peak MB/min':>11}")
+        for name, seconds, peak_mb in bench_load_pipeline(args.pipeline_minutes, max(1, args.repeats)):
+            print(f"{name:>14}  {seconds * 1000:>7.1f}  {peak_mb:>11.2f}")
+        return
+
+    text = SAMPLE_TEXT
+    if args.text:
+        with open(args.text, "r", encoding="utf-8") as f:
+            text = f.read()
+    counts = [int(c) for c in args.workers.split(",") if c.strip()]
+
+    print(f"cores: {os.cpu_count()}  chars: {len(text)}  voice: {args.voice}")
+    print(f"{'workers':>7}  {'synth s':>8}  {'audio s':>8}  {'RTF':>6}  {'speedup':>7}")
+    rows = bench_workers(text, args.voice, counts, args.repeats, args.voices_dir)
+    baseline = rows[0][1] if rows else None
+    for workers, elapsed, audio_seconds, rtf in rows:
+        print(f"{workers:>7}  {elapsed:>8.2f}  {audio_seconds:>8.1f}  {rtf:>6.3f}  {baseline / elapsed:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,14 +2,25 @@
 # Copyright (C) 2025 echoType
 
 import os
+import re
 import sys
+import json
 import shutil
 import subprocess
-import wave
+import queue
+import tempfile
+import threading
+import multiprocessing
+from bisect import bisect_right
+from collections import OrderedDict, deque
+from math import gcd
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import sounddevice as sd
 import soundfile as sf
-from scipy.signal import butter, lfilter
+from scipy.signal import butter, resample_poly, sosfilt
+
+from text_normalizer import NormalizedText
 
 try:
     from piper import PiperVoice
@@ -18,6 +29,857 @@ except ImportError:
     PiperVoice = None
     SynthesisConfig = None
 
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?;:])\s+|\n+')
+
+
+def split_sentences(text):
+    """Split text into the sentence-sized pieces fed to Piper one at a time."""
+    return [part.strip() for part in _SENTENCE_SPLIT_RE.split(text or "") if part and part.strip()]
+
+
+def sentence_char_offsets(text, sentences):
+    """Character offset of each of `sentences` (from `split_sentences`) within `text`."""
+    offsets = []
+    cursor = 0
+    for sentence in sentences:
+        found = text.find(sentence, cursor)
+        offsets.append(found if found >= 0 else cursor)
+        cursor = offsets[-1] + len(sentence)
+    return offsets
+
+
+_WORD_RE = re.compile(r"\w[\w'\u2019-]*")
+# Phonemes that separate words or pad an utterance rather than being spoken
+_PHONEME_BREAKS = frozenset(" ^$_.,;:!?\u2014\u2026\"()")
+
+# Phoneme durations as stored with cached sentence segments
+_ALIGNMENT_DTYPE = np.dtype([("phoneme", "U8"), ("samples", np.int32)])
+
+# One row per spoken word: its span in the synthesized text and in raw samples
+WORD_TIMING_DTYPE = np.dtype([
+    ("char_start", np.int32),
+    ("char_end", np.int32),
+    ("start", np.int64),
+    ("end", np.int64),
+])
+
+
+def _synthesize_aligned(voice, text, syn_config):
+    """Run `voice` on `text`; returns (int16 PCM, [(phoneme, samples)] or None).
+
+    Phoneme durations are only available from Piper builds and voice exports
+    that support alignments; otherwise the second item is None.
+    """
+    try:
+        chunks = voice.synthesize(text, syn_config=syn_config, include_alignments=True)
+    except TypeError:
+        chunks = voice.synthesize(text, syn_config=syn_config)
+    parts = []
+    alignment = []
+    for chunk in chunks:
+        parts.append(chunk.audio_int16_array)
+        found = getattr(chunk, "phoneme_alignments", None)
+        if alignment is not None and found:
+            alignment.extend((a.phoneme, int(a.num_samples)) for a in found)
+        else:
+            alignment = None
+    pcm = np.concatenate(parts).reshape(-1) if parts else np.zeros(0, dtype=np.int16)
+    return pcm, (alignment or None)
+
+
+def _phoneme_word_spans(alignment):
+    spans = []
+    cursor = 0
+    start = None
+    for phoneme, samples in alignment:
+        if phoneme in _PHONEME_BREAKS:
+            if start is not None:
+                spans.append((start, cursor))
+                start = None
+        elif start is None:
+            start = cursor
+        cursor += samples
+    if start is not None:
+        spans.append((start, cursor))
+    return spans
+
+
+def word_timings(sentence, n_samples, alignment=None):
+    """[(char_start, char_end, sample_start, sample_end)] for the words of one sentence.
+
+    Uses Piper's phoneme durations when they line up one-to-one with the words
+    of `sentence`; otherwise spreads the sentence's samples by character offset.
+    """
+    words = [(m.start(), m.end()) for m in _WORD_RE.finditer(sentence)]
+    if not words:
+        return []
+    spans = _phoneme_word_spans(alignment) if alignment else None
+    if spans is None or len(spans) != len(words):
+        total = max(len(sentence), 1)
+        spans = [(n_samples * a // total, n_samples * b // total) for a, b in words]
+    return [(a, b, min(s, n_samples), min(e, n_samples)) for (a, b), (s, e) in zip(words, spans)]
+
+
+class _GrowingAudioBuffer:
+    """Append-only audio buffer; capacity doubles so appends stay amortized O(n).
+
+    Given `spill_path`, the samples move to that file once there are more than
+    `spill_after` of them; later appends go straight to the file and `view()`
+    returns a read-only mapping of it.
+    """
+
+    def __init__(self, capacity=0, dtype=np.float32, spill_path=None, spill_after=None):
+        self._data = np.zeros(max(int(capacity), 0), dtype=dtype)
+        self.length = 0
+        self._spill_path = spill_path
+        self._spill_after = spill_after
+        self._file = None
+        self._mapped = None
+
+    @property
+    def spilled(self):
+        return self._data is None
+
+    def append(self, samples):
+        n = len(samples)
+        needed = self.length + n
+        if self._data is not None and self._spill_path is not None and needed > self._spill_after:
+            self._file = open(self._spill_path, "wb")
+            self._data[:self.length].tofile(self._file)
+            self._dtype = self._data.dtype
+            self._data = None
+        if self._data is None:
+            np.asarray(samples, dtype=self._dtype).tofile(self._file)
+            self._file.flush()
+            self.length = needed
+            self._mapped = None
+            return
+        if needed > len(self._data):
+            grown = np.zeros(max(needed, 2 * len(self._data), 1 << 15), dtype=self._data.dtype)
+            grown[:self.length] = self._data[:self.length]
+            self._data = grown
+        self._data[self.length:needed] = samples
+        self.length = needed
+
+    def view(self):
+        if self._data is not None:
+            return self._data[:self.length]
+        if self._mapped is None:
+            self._mapped = np.memmap(self._spill_path, dtype=self._dtype, mode="r", shape=(self.length,))
+        return self._mapped
+
+    def close(self):
+        """Finish appending; a spilled buffer keeps serving its mapping."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class SegmentedAudio:
+    """Playback audio kept as an ordered list of segments that are never joined.
+
+    One writer appends segments (a synthesized sentence, a stretched piece)
+    while the audio callback reads: `read_into` finds the segment under a
+    position by bisection and copies across joins without locking or
+    allocating, and `length` is only raised once the segment it covers is in
+    place. Appended arrays are kept as they are. Given `spill_path` (a
+    function returning a new file path), all segments move to block files
+    once there are more than `spill_after` samples, later ones are written
+    there directly, and they are played from the files' mappings; `filenames`
+    lists those files.
+    """
+
+    BLOCK_SAMPLES = 1 << 22
+
+    def __init__(self, dtype=np.float32, spill_path=None, spill_after=None):
+        self.dtype = np.dtype(dtype)
+        self.segments = []
+        self.starts = []
+        self.length = 0
+        self.filenames = []
+        self._spill_path = spill_path
+        self._spill_after = spill_after
+        self._block = None
+        self._block_used = 0
+
+    @property
+    def spilled(self):
+        return bool(self.filenames)
+
+    def __len__(self):
+        return self.length
+
+    def append(self, samples):
+        n = len(samples)
+        if not n:
+            return
+        if self._spill_path is not None and self.length + n > self._spill_after:
+            if not self.filenames:
+                # The copies on disk hold the same samples, so the callback may read either
+                for index, segment in enumerate(self.segments):
+                    self.segments[index] = self._spill(segment)
+            segment = self._spill(samples)
+        else:
+            segment = np.asarray(samples, dtype=self.dtype)
+        self.segments.append(segment)
+        self.starts.append(self.length)
+        self.length += n
+
+    def _spill(self, samples):
+        n = len(samples)
+        if self._block is None or self._block_used + n > len(self._block):
+            path = self._spill_path()
+            self._block = np.memmap(path, dtype=self.dtype, mode="w+", shape=(max(n, self.BLOCK_SAMPLES),))
+            self._block_used = 0
+            self.filenames.append(path)
+        segment = self._block[self._block_used:self._block_used + n]
+        segment[:] = samples
+        self._block_used += n
+        return segment
+
+    def read_into(self, position, out):
+        """Copy the `len(out)` samples from `position` into float32 `out`; they must all exist."""
+        segments = self.segments
+        starts = self.starts
+        index = bisect_right(starts, position) - 1
+        filled = 0
+        wanted = len(out)
+        while filled < wanted:
+            segment = segments[index]
+            offset = position + filled - starts[index]
+            take = min(len(segment) - offset, wanted - filled)
+            if segment.dtype == np.int16:
+                np.multiply(segment[offset:offset + take], _INT16_SCALE, out=out[filled:filled + take])
+            else:
+                out[filled:filled + take] = segment[offset:offset + take]
+            filled += take
+            index += 1
+
+
+class _JoinCrossfade:
+    """Overlaps consecutive int16 sentences with an 8 ms equal-power crossfade.
+
+    `push(pcm)` returns the part of the joined signal that is final once `pcm`
+    has arrived: its head mixed into the tail held back from the previous
+    sentence, then its body. Its own tail waits for the next sentence, and
+    `flush()` returns it at the end. Each piece starts where its sentence
+    starts, so sentence and word offsets stay running totals of piece lengths.
+    """
+
+    def __init__(self, sample_rate, seconds=0.008):
+        self.overlap = max(1, int(sample_rate * seconds))
+        phase = (np.arange(self.overlap, dtype=np.float32) + 0.5) * np.float32(0.5 * np.pi / self.overlap)
+        self._fade_in = np.sin(phase)
+        self._fade_out = np.cos(phase)
+        self._tail = None
+
+    def push(self, pcm):
+        overlap = self.overlap
+        if len(pcm) < 2 * overlap:
+            pcm = np.concatenate([pcm, np.zeros(2 * overlap - len(pcm), dtype=np.int16)])
+        body = pcm[:len(pcm) - overlap]
+        if self._tail is not None:
+            mixed = self._tail * self._fade_out + pcm[:overlap] * self._fade_in
+            np.clip(np.rint(mixed, out=mixed), -32768, 32767, out=mixed)
+            body = np.concatenate([mixed.astype(np.int16), body[overlap:]])
+        self._tail = pcm[len(pcm) - overlap:]
+        return body
+
+    def flush(self):
+        tail, self._tail = self._tail, None
+        return np.zeros(0, dtype=np.int16) if tail is None else tail
+
+
+def _crossfaded(chunks):
+    """Join the chunks of `TTSManager._iter_pcm_chunks` with `_JoinCrossfade`.
+
+    Yields (piece, pcm, sample_rate, fraction, index, alignment): the chunk's
+    part of the joined signal followed by the chunk itself. A last item with
+    `pcm` and `index` None carries the final tail.
+    """
+    join = None
+    try:
+        for pcm, sr, fraction, index, alignment in chunks:
+            if join is None:
+                join = _JoinCrossfade(sr)
+            yield join.push(pcm), pcm, sr, fraction, index, alignment
+        if join is not None:
+            yield join.flush(), None, sr, fraction, None, None
+    finally:
+        if hasattr(chunks, "close"):
+            chunks.close()
+
+
+def time_stretch(samples, speed, sample_rate):
+    """Pitch-preserving WSOLA time-stretch; `speed` > 1 plays faster.
+
+    Frames are 30 ms with 50% overlap. Each frame's offset is searched within a
+    +/- 7.5 ms tolerance, first on a signal decimated to about 2.75 kHz (whatever
+    the sample rate) and then refined at the full rate over the first half of
+    the overlap, so the Python loop stays cheap and overlap-add is fully vectorized.
+    """
+    pieces = list(iter_time_stretch(samples, speed, sample_rate))
+    return pieces[0] if len(pieces) == 1 else np.concatenate(pieces)
+
+
+def _float_audio(samples):
+    if samples.dtype == np.int16:
+        return np.multiply(samples, _INT16_SCALE, dtype=np.float32)
+    return np.asarray(samples, dtype=np.float32)
+
+
+def iter_time_stretch(samples, speed, sample_rate, block_frames=None):
+    """Yield `time_stretch(samples, speed, sample_rate)` in consecutive pieces.
+
+    Each piece covers `block_frames` output frames (all of them when None) and
+    reads only the input those frames can reach. The search position and the
+    overlap tail carry over between pieces, so the joined pieces equal a single
+    pass and `samples` may be memory-mapped int16 or float32 audio.
+    """
+    speed = float(speed)
+    hop = max(64, int(0.015 * sample_rate))
+    frame = 2 * hop
+    tol = hop // 2
+    dec = max(4, int(sample_rate) // 2756)
+    n = len(samples)
+    if abs(speed - 1.0) < 1e-3 or n < 2 * frame:
+        yield _float_audio(samples)
+        return
+    out_len = int(round(n / speed))
+    count = out_len // hop + 1
+    analysis_hop = hop * speed
+    # Length of the zero-padded input (the signal starts at `tol`)
+    total = tol + max(n, int(count * analysis_hop)) + 2 * tol + frame + 4 * dec
+    coarse_hop = hop // dec
+    coarse_span = (2 * tol) // dec
+    fine = hop // 2
+    # Periodic Hann at 50% overlap sums to one, so no normalization pass is needed
+    window = (0.5 - 0.5 * np.cos(2.0 * np.pi * np.arange(frame) / frame)).astype(np.float32)
+    block_frames = count if block_frames is None else max(2, int(block_frames))
+
+    previous = tol
+    tail = None
+    emitted = 0
+    correlate = np.correlate
+    argmax = np.argmax
+    for k0 in range(0, count, block_frames):
+        k1 = min(k0 + block_frames, count)
+        # Every index this piece touches lies in [w0, w1); w0 stays on the
+        # decimation grid so the coarse signal matches a single pass
+        w0 = max(0, min(int(k0 * analysis_hop), previous) // dec - 2) * dec
+        w1 = total if k1 == count else min(total, int(k1 * analysis_hop) + 2 * tol + 2 * frame + 4 * dec)
+        padded = np.zeros(w1 - w0, dtype=np.float32)
+        a, b = max(w0, tol), min(w1, tol + n)
+        if b > a:
+            padded[a - w0:b - w0] = _float_audio(samples[a - tol:b - tol])
+        usable = len(padded) // dec * dec
+        coarse_signal = padded[:usable].reshape(-1, dec).mean(axis=1)
+        c0 = w0 // dec
+
+        positions = np.empty(k1 - k0, dtype=np.int64)
+        for k in range(max(k0, 1), k1):
+            # Best match for the natural continuation of the previously chosen frame
+            target = previous + hop - w0
+            cl = int(k * analysis_hop) // dec - c0
+            ct = target // dec
+            best = (cl + int(argmax(correlate(coarse_signal[cl:cl + coarse_span + coarse_hop],
+                                              coarse_signal[ct:ct + coarse_hop], "valid")))) * dec
+            lo = best - dec if best + w0 >= dec else 0
+            previous = w0 + lo + int(argmax(correlate(padded[lo:lo + 2 * dec + fine],
+                                                      padded[target:target + fine], "valid")))
+            positions[k - k0] = previous
+        if k0 == 0:
+            positions[0] = tol
+        positions -= w0
+
+        # Even frames tile the output exactly, so they are written and the odd
+        # ones added on top; rows are gathered from a strided view without index arrays
+        windows = np.lib.stride_tricks.sliding_window_view(padded, frame)
+        out = np.zeros((k1 - k0) * hop + frame, dtype=np.float32)
+        for first, step_positions in ((0, positions[0::2]), (1, positions[1::2])):
+            for j0 in range(0, len(step_positions), 1024):
+                frames = windows[step_positions[j0:j0 + 1024]]
+                frames *= window
+                base = (2 * j0 + first) * hop
+                if first:
+                    out[base:base + frames.size] += frames.reshape(-1)
+                else:
+                    out[base:base + frames.size] = frames.reshape(-1)
+        if tail is not None:
+            out[:hop] += tail
+        done = (k1 - k0) * hop
+        tail = out[done:done + hop].copy()
+        piece = out[:min(done, out_len - emitted)] if k1 < count else out[:out_len - emitted]
+        emitted += len(piece)
+        yield piece
+
+
+def _smooth_in_place(data, block=1 << 18):
+    """3-tap [0.2, 0.6, 0.2] smoothing of `data` in place, `block` samples at a time."""
+    n = len(data)
+    if n == 0:
+        return data
+    scratch = np.empty(min(block, n), dtype=np.float32)
+    previous = 0.0
+    for start in range(0, n, block):
+        end = min(start + block, n)
+        seg = data[start:end]
+        side = scratch[:end - start]
+        following = float(data[end]) if end < n else 0.0
+        last = float(seg[-1])
+        np.multiply(seg, 0.2, out=side)
+        seg *= 0.6
+        seg[1:] += side[:-1]
+        seg[:-1] += side[1:]
+        seg[0] += 0.2 * previous
+        seg[-1] += 0.2 * following
+        previous = last
+    return data
+
+
+# Gain applied before saturation. Fixed (as if every input peaked at full
+# scale, which Piper's normalized output nearly does) rather than derived from
+# the audio's peak, so a sentence sounds equally loud whether it was streamed
+# on its own or loaded as part of a whole cached generation
+_SOFTEN_GAIN = 0.85 * 0.9
+
+
+def _soften_in_place(data, block=1 << 18):
+    """Apply a fixed gain, tanh-saturate and smooth float32 `data` in place."""
+    n = len(data)
+    if n == 0:
+        return data
+    for start in range(0, n, block):
+        seg = data[start:start + block]
+        seg *= _SOFTEN_GAIN
+        np.tanh(seg, out=seg)
+    return _smooth_in_place(data, block)
+
+
+def resample_audio(samples, from_rate, to_rate, out=None, block=1 << 18):
+    """Polyphase-resample float32 audio from `from_rate` to `to_rate`.
+
+    Works through `block`-sized pieces with enough overlap for the filter that
+    the result matches a single `resample_poly` pass, so `samples` and `out`
+    may be memory-mapped.
+    """
+    g = gcd(int(from_rate), int(to_rate))
+    up, down = int(to_rate) // g, int(from_rate) // g
+    n = len(samples)
+    out_len = -(-n * up // down)
+    if out is None:
+        out = np.empty(out_len, dtype=np.float32)
+    # Piece boundaries on multiples of `down` map to whole output samples
+    block = max(down, block // down * down)
+    half = 10 * max(up, down) // up + 2  # resample_poly's filter half-length, in input samples
+    pad = down * -(-half // down)
+    for start in range(0, n, block):
+        end = min(start + block, n)
+        lo = max(0, start - pad)
+        piece = resample_poly(samples[lo:min(n, end + pad)], up, down)
+        skip = (start - lo) * up // down
+        o0 = start * up // down
+        o1 = out_len if end == n else end * up // down
+        out[o0:o1] = piece[skip:skip + o1 - o0]
+    return out
+
+
+_INT16_SCALE = np.float32(1.0 / 32767.0)
+
+
+def _quantize_int16(samples):
+    """float32 audio in [-1, 1] to int16, reusing `samples` as scratch."""
+    np.clip(samples, -1.0, 1.0, out=samples)
+    np.multiply(samples, 32767.0, out=samples)
+    np.rint(samples, out=samples)
+    return samples.astype(np.int16)
+
+
+def soften_pcm(pcm, out=None):
+    """Convert int16 PCM into softened float32 playback audio inside a single buffer.
+
+    Each stage (scale, gain, saturate, smooth) runs in place on `out`, which
+    is allocated once when not supplied.
+    """
+    if out is None:
+        out = np.empty(len(pcm), dtype=np.float32)
+    np.multiply(pcm, np.float32(1.0 / 32768.0), out=out)
+    return _soften_in_place(out)
+
+
+class BlockDistortion:
+    """Radio-style band-pass (300-3400 Hz) plus tanh saturation, applied per block.
+
+    The second-order sections are designed once per sample rate and the filter
+    state is carried from one block to the next, so playback callbacks can
+    process audio in place as it is played. `sosfilt` allocates its output and
+    state on every call, so the filter is instead applied to `BLOCK`-sample
+    pieces as precomputed matrix products (impulse responses of the cascade from
+    rest and from each unit state) written into preallocated buffers.
+    """
+
+    BLOCK = 64
+
+    def __init__(self, low_hz=300.0, high_hz=3400.0, drive=1.3):
+        self.low_hz = low_hz
+        self.high_hz = high_hz
+        self.drive = drive
+        self.sample_rate = None
+        self._kernels = None
+        self._state = None
+
+    def configure(self, sample_rate):
+        if sample_rate == self.sample_rate:
+            return
+        sos = None
+        if sample_rate and sample_rate > 0:
+            nyquist = sample_rate * 0.5
+            low = max(self.low_hz / nyquist, 0.0001)
+            high = min(self.high_hz / nyquist, 0.99)
+            if low < high:
+                sos = butter(4, [low, high], btype="band", output="sos")
+        self._kernels = self._block_kernels(sos) if sos is not None else None
+        order = 2 * len(sos) if sos is not None else 0
+        self._state = np.zeros(order)
+        self._state_a = np.zeros(order)
+        self._state_b = np.zeros(order)
+        self._x = np.zeros(self.BLOCK)
+        self._y = np.zeros(self.BLOCK)
+        self._from_state = np.zeros(self.BLOCK)
+        self.sample_rate = sample_rate
+
+    @classmethod
+    def _block_kernels(cls, sos):
+        """Per piece length r: (H, C, A, B) with y = H x + C s and s' = A s + B x."""
+        sections = len(sos)
+        order = 2 * sections
+        unit_states = np.eye(order).reshape(order, sections, 2).transpose(1, 2, 0)
+        kernels = [None]
+        for r in range(1, cls.BLOCK + 1):
+            from_input, input_state = sosfilt(sos, np.eye(r), axis=0, zi=np.zeros((sections, 2, r)))
+            from_state, state_state = sosfilt(sos, np.zeros((r, order)), axis=0, zi=unit_states)
+            kernels.append(tuple(np.ascontiguousarray(m) for m in (
+                from_input, from_state, state_state.reshape(order, order), input_state.reshape(order, r)
+            )))
+        return kernels
+
+    def reset(self):
+        if self._state is not None:
+            self._state.fill(0.0)
+
+    def process(self, block):
+        """Filter and saturate `block` in place."""
+        if self._kernels is None:
+            np.multiply(block, self.drive, out=block)
+            np.tanh(block, out=block)
+            return block
+        state = self._state
+        n = len(block)
+        pos = 0
+        while pos < n:
+            r = min(self.BLOCK, n - pos)
+            from_input, from_state, state_state, input_state = self._kernels[r]
+            x = self._x[:r]
+            y = self._y[:r]
+            extra = self._from_state[:r]
+            np.copyto(x, block[pos:pos + r])
+            np.dot(from_input, x, out=y)
+            np.dot(from_state, state, out=extra)
+            y += extra
+            np.dot(state_state, state, out=self._state_a)
+            np.dot(input_state, x, out=self._state_b)
+            np.add(self._state_a, self._state_b, out=state)
+            y *= self.drive
+            np.tanh(y, out=block[pos:pos + r])
+            pos += r
+        return block
+
+
+class VoicePool:
+    """Loaded PiperVoice instances kept resident, keyed by model path.
+
+    Voices are loaded on first use (or ahead of time via `preload`) and stay in
+    memory until the estimated total, based on model file sizes, exceeds
+    `max_bytes`; the least recently used voice is dropped first.
+    """
+
+    def __init__(self, max_bytes=1024 ** 3):
+        self.max_bytes = int(max_bytes)
+        self._voices = OrderedDict()  # model_path -> (voice, size), oldest first
+        self._loading = {}            # model_path -> Event set when its load finishes
+        self._lock = threading.Lock()
+
+    def get(self, model_path, config_path):
+        while True:
+            with self._lock:
+                if model_path in self._voices:
+                    self._voices.move_to_end(model_path)
+                    return self._voices[model_path][0]
+                pending = self._loading.get(model_path)
+                if pending is None:
+                    pending = self._loading[model_path] = threading.Event()
+                    break
+            # Someone else is loading this voice; wait for them instead of loading twice
+            pending.wait()
+        try:
+            voice = PiperVoice.load(model_path, config_path)
+            try:
+                size = os.path.getsize(model_path)
+            except OSError:
+                size = 0
+            with self._lock:
+                self._voices[model_path] = (voice, size)
+                self._evict_locked(keep=model_path)
+            return voice
+        finally:
+            with self._lock:
+                self._loading.pop(model_path, None)
+            pending.set()
+
+    def preload(self, voice_paths):
+        """Load (model_path, config_path) pairs on a background thread."""
+        def task():
+            for model_path, config_path in voice_paths:
+                try:
+                    self.get(model_path, config_path)
+                except Exception:
+                    pass
+
+        threading.Thread(target=task, daemon=True).start()
+
+    def is_loaded(self, model_path):
+        with self._lock:
+            return model_path in self._voices
+
+    def _evict_locked(self, keep=None):
+        total = sum(size for _, size in self._voices.values())
+        for path in list(self._voices):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            total -= self._voices.pop(path)[1]
+
+
+# Per-process voices for ParallelSynthesizer workers: the preloaded ones plus
+# any other voice on first use
+_worker_voices = OrderedDict()
+_WORKER_MAX_VOICES = 3
+_worker_max_voices = _WORKER_MAX_VOICES
+
+
+def _worker_voice_for(model_path, config_path):
+    voice = _worker_voices.get(model_path)
+    if voice is None:
+        voice = _worker_voices[model_path] = PiperVoice.load(model_path, config_path)
+        while len(_worker_voices) > _worker_max_voices:
+            _worker_voices.popitem(last=False)
+    _worker_voices.move_to_end(model_path)
+    return voice
+
+
+def _init_synthesis_worker(voice_paths):
+    global _worker_max_voices
+    _worker_max_voices = max(_WORKER_MAX_VOICES, len(voice_paths))
+    for model_path, config_path in voice_paths:
+        try:
+            _worker_voice_for(model_path, config_path)
+        except Exception:
+            pass  # reported by the first shard that needs this voice
+
+
+def _warm_synthesis_worker():
+    return os.getpid()
+
+
+def _synthesize_shard(model_path, config_path, text, eff_scale):
+    voice = _worker_voice_for(model_path, config_path)
+    pcm, alignment = _synthesize_aligned(voice, text, SynthesisConfig(length_scale=eff_scale))
+    return pcm, voice.config.sample_rate, alignment
+
+
+class ParallelSynthesizer:
+    """Pool of worker processes, each holding its own loaded PiperVoice(s).
+
+    Sentences are submitted as independent shards and their PCM is yielded back
+    strictly in document order, so the output can feed streaming playback.
+    """
+
+    def __init__(self, model_path, config_path, workers, preload=()):
+        self.model_path = model_path
+        self.config_path = config_path
+        self.workers = max(1, int(workers))
+        # (model_path, config_path) pairs every worker loads when it starts
+        self.preload = [pair for pair in preload if pair[0] != model_path]
+        self._executor = None
+
+    def _ensure_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_synthesis_worker,
+                initargs=(self.preload + [(self.model_path, self.config_path)],),
+            )
+        return self._executor
+
+    def warm(self):
+        """Start the workers now, so their voices are loaded before the first request."""
+        executor = self._ensure_executor()
+        for _ in range(self.workers):
+            executor.submit(_warm_synthesis_worker)
+
+    def iter_chunks(self, sentences, eff_scale, model_path=None, config_path=None):
+        executor = self._ensure_executor()
+        # Workers keep every voice they have used, so switching voices needs no restart
+        voice = (model_path or self.model_path, config_path or self.config_path)
+        total_chars = max(sum(len(s) for s in sentences), 1)
+        done_chars = 0
+        # Keep a bounded window in flight so an abandoned stream cancels cheaply
+        window = self.workers * 2
+        remaining = enumerate(sentences)
+        pending = deque()
+        try:
+            for index, sentence in remaining:
+                pending.append((index, len(sentence), executor.submit(_synthesize_shard, *voice, sentence, eff_scale)))
+                if len(pending) >= window:
+                    break
+            while pending:
+                index, chars, future = pending.popleft()
+                pcm, sr, alignment = future.result()
+                following = next(remaining, None)
+                if following is not None:
+                    pending.append((following[0], len(following[1]),
+                                    executor.submit(_synthesize_shard, *voice, following[1], eff_scale)))
+                done_chars += chars
+                if len(pcm):
+                    yield pcm, sr, done_chars / total_chars, index, alignment
+        finally:
+            for _, _, future in pending:
+                future.cancel()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+class PiperCliWorker:
+    """Long-lived `piper --json-input` process so the ONNX model loads only once.
+
+    Each request is one JSON line naming an output file; piper prints a line on
+    stdout when that file is written. A dead process or a request that times out
+    is restarted once before the error is raised.
+    """
+
+    def __init__(self, base_cmd, model_path, config_path, length_scale=1.0, timeout=60.0):
+        self.base_cmd = list(base_cmd)
+        self.model_path = model_path
+        self.config_path = config_path
+        self.length_scale = float(length_scale)
+        self.timeout = float(timeout)
+        self.restarts = 0
+        self._proc = None
+        self._lines = None
+        self._stderr_tail = deque(maxlen=40)
+        self._tmp_dir = None
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def matches(self, model_path, length_scale):
+        return self.model_path == model_path and abs(self.length_scale - float(length_scale)) < 1e-6
+
+    def is_healthy(self):
+        return self._proc is not None and self._proc.poll() is None
+
+    def _start(self):
+        cmd = self.base_cmd + ["--model", self.model_path, "--config", self.config_path, "--json-input"]
+        if self.length_scale != 1.0:
+            cmd += ["--length_scale", str(self.length_scale)]
+        if self._tmp_dir is None:
+            self._tmp_dir = tempfile.mkdtemp(prefix="echotype_piper_")
+        self._proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            bufsize=1
+        )
+        self._lines = queue.Queue()
+        proc, lines, tail = self._proc, self._lines, self._stderr_tail
+
+        # Drain both pipes on helper threads so piper never blocks on a full pipe
+        def pump_stdout():
+            for line in proc.stdout:
+                lines.put(line)
+            lines.put(None)
+
+        def pump_stderr():
+            for line in proc.stderr:
+                tail.append(line.rstrip())
+
+        threading.Thread(target=pump_stdout, daemon=True).start()
+        threading.Thread(target=pump_stderr, daemon=True).start()
+
+    def _request(self, text):
+        if not self.is_healthy():
+            self._start()
+        self._counter += 1
+        out_path = os.path.join(self._tmp_dir, f"{self._counter}.wav")
+        self._proc.stdin.write(json.dumps({"text": text, "output_file": out_path}) + "\n")
+        self._proc.stdin.flush()
+        try:
+            line = self._lines.get(timeout=self.timeout + 0.05 * len(text))
+        except queue.Empty:
+            raise TimeoutError("Piper worker did not answer in time.")
+        if line is None or not os.path.isfile(out_path):
+            raise RuntimeError("Piper worker exited unexpectedly.")
+        try:
+            pcm, sr = sf.read(out_path, dtype="int16")
+        finally:
+            os.remove(out_path)
+        return pcm.reshape(-1), sr
+
+    def synthesize(self, text):
+        """Return (int16 PCM, sample_rate) for `text`, restarting the worker once on failure."""
+        with self._lock:
+            try:
+                return self._request(text)
+            except (OSError, RuntimeError, TimeoutError, ValueError):
+                self._stop()
+                self.restarts += 1
+            try:
+                return self._request(text)
+            except (OSError, RuntimeError, TimeoutError, ValueError) as exc:
+                self._stop()
+                raise RuntimeError(
+                    f"Piper synthesis failed: {exc}\n"
+                    f"STDERR:\n" + "\n".join(self._stderr_tail)
+                ) from exc
+
+    def _stop(self):
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+        except Exception:
+            pass
+        try:
+            proc.wait(timeout=2)
+        except Exception:
+            proc.kill()
+
+    def close(self):
+        with self._lock:
+            self._stop()
+            if self._tmp_dir:
+                shutil.rmtree(self._tmp_dir, ignore_errors=True)
+                self._tmp_dir = None
+
+
 class TTSManager:
     def __init__(self,
                  filename='TypingTTS.wav',
@@ -25,7 +887,18 @@ class TTSManager:
                  model_basename='en_US-libritts-high.onnx',
                  piper_length_scale=1.0,
                  use_synth_speed=True,
-                 invert_ui_speed=True
+                 invert_ui_speed=True,
+                 stream_synthesis=True,
+                 synthesis_workers=1,
+                 speed_mode="stretch",
+                 voice_pool=None,
+                 stream_blocksize=0,
+                 stream_latency="low",
+                 memmap_min_seconds=None,
+                 compact_audio=False,
+                 resample_to_device=True,
+                 segment_cache=None,
+                 text_normalizer=None
                  ):
         self.filename = filename
         self.wav_file = filename
@@ -35,6 +908,22 @@ class TTSManager:
         self.piper_length_scale = float(piper_length_scale)
         self.use_synth_speed = bool(use_synth_speed)
         self.invert_ui_speed = bool(invert_ui_speed)
+        # "stretch": synthesize once and time-stretch on speed changes (instant).
+        # "resynth": re-run Piper with a new length_scale (slower, higher quality).
+        self.speed_mode = speed_mode if speed_mode in ("stretch", "resynth") else "stretch"
+        self.playback_speed = 1.0
+        self.stream_synthesis = bool(stream_synthesis)
+        self.synthesis_workers = max(1, int(synthesis_workers or 1))
+        self._parallel = None
+        self._preload_voices = []  # (model_path, config_path) pairs from `preload_voices`
+        self._cli_workers = OrderedDict()  # model_path -> PiperCliWorker, most recent last
+        self.voice_pool = voice_pool or VoicePool()
+        # Optional GenerationCache of per-sentence audio, keyed by sentence text,
+        # voice and length_scale, so unchanged sentences are never re-synthesized
+        self.segment_cache = segment_cache
+        # Optional TextNormalizer: Piper reads its spelled-out form of the text
+        # while word timings still point into the original
+        self.text_normalizer = text_normalizer
 
         self.audio_data = None
         self.sample_rate = None
@@ -44,13 +933,59 @@ class TTSManager:
         self.playback_thread = None
         self.is_armed = False
         self.distortion_enabled = False
+        self._distortion = BlockDistortion()
         self._clean_audio = None
         self.playback_finished = False
+        # 0 lets PortAudio pick the block size; small blocks are safe because the
+        # callback does no allocation or DSP setup
+        self.stream_blocksize = int(stream_blocksize or 0)
+        self.stream_latency = stream_latency
+        self.output_underflows = 0  # blocks PortAudio reported as underflowed
+        self.starved_blocks = 0     # blocks padded with silence while waiting on synthesis
 
         # Track last synthesis so we can re-synthesize if speed changes
         self._last_text = None
         self._last_synth_scale = None  # this stores the last *Piper* length_scale used
 
+        # Streaming synthesis state. `_synth_generation` is bumped whenever a new
+        # synthesis starts (or the voice changes) so an older stream stops early.
+        self._buffer_lock = threading.Lock()
+        self._synth_generation = 0
+        self._synth_pending = False
+        self._stream_fraction = None
+        self._play_buffer = None  # stretched audio appended while streaming at a speed other than 1.0x
+        self._audio_in_memory = False
+        # Piper's int16 output for the current text; only written to disk on save_audio()
+        self._raw_pcm = None
+        self._raw_sample_rate = None
+        self._raw_path = None  # set instead of `_raw_pcm` when audio is played from disk
+        # Audio at least this long is processed into memory-mapped scratch files
+        # and played from there instead of being held in RAM (None disables)
+        self.memmap_min_seconds = memmap_min_seconds
+        self._memmapped = False
+        self._memmap_dir = None
+        self._memmap_paths = []
+        self._memmap_counter = 0
+        # Stretching memory-mapped audio finishes on a worker thread; bumping
+        # `_render_generation` abandons a render that is still running
+        self._render_generation = 0
+        self._render_pending = False
+        # Keep in-memory playback audio as int16 (half the memory of float32);
+        # the callback converts each block back to float as it plays
+        self.compact_audio = bool(compact_audio)
+        # Resample once at load time to the output device's rate so PortAudio
+        # and the OS mixer do not resample on every callback
+        self.resample_to_device = bool(resample_to_device)
+        # ((source, playback rate), raw pcm, prepared clean audio) for the loaded
+        # audio only, so rewinding or changing speed does not soften it again
+        self._prepared = None
+        # Tables describing the current audio, persisted with cached generations.
+        # "sentences": int64 start offset of each sentence in raw (Piper-rate) samples.
+        # "words": WORD_TIMING_DTYPE rows mapping each word's text span to its samples.
+        self.timings = {}
+        self.loop_sentence = None
+        self._loop_range = None  # (start, end) in playback samples while looping
+
         base_dir = self._resource_root()
         self.voices_dir = voices_dir or os.path.join(base_dir, "voices")
         if not os.path.isdir(self.voices_dir):
@@ -108,15 +1043,33 @@ class TTSManager:
         if PiperVoice is None:
             self._embedded_voice_error = "Python package `piper` is not available."
             return
+        if self.synthesis_workers > 1:
+            # The worker processes hold the voices; loading one here would only duplicate it
+            self._embedded_voice = None
+            self._use_embedded_voice = True
+            return
         try:
-            self._embedded_voice = PiperVoice.load(self.model_path, self.config_path)
+            self._embedded_voice = self.voice_pool.get(self.model_path, self.config_path)
             self._use_embedded_voice = True
         except Exception as e:
             self._embedded_voice_error = f"{type(e).__name__}: {e}"
             self._embedded_voice = None
             self._use_embedded_voice = False
 
-    def _synthesize_with_cli(self, input_text, eff_scale):
+    def _iter_embedded_chunks(self, sentences, eff_scale):
+        if self._embedded_voice is None or SynthesisConfig is None:
+            raise RuntimeError("Embedded Piper voice unavailable.")
+        syn_config = SynthesisConfig(length_scale=eff_scale)
+        total_chars = max(sum(len(s) for s in sentences), 1)
+        done_chars = 0
+        for index, sentence in enumerate(sentences):
+            pcm, alignment = _synthesize_aligned(self._embedded_voice, sentence, syn_config)
+            done_chars += len(sentence)
+            if not len(pcm):
+                continue
+            yield pcm, self._embedded_voice.config.sample_rate, done_chars / total_chars, index, alignment
+
+    def _iter_cli_chunks(self, sentences, eff_scale):
         if not self._piper_cmd:
             detail = f"\nEmbedded init error: {self._embedded_voice_error}" if self._embedded_voice_error else ""
             raise RuntimeError(
@@ -124,51 +1077,261 @@ class TTSManager:
                 " Bundle `piper` with the executable or ensure embedded dependencies are included."
                 f"{detail}"
             )
-        cmd = (
-            self._piper_cmd
-            + ["--model", self.model_path,
-               "--config", self.config_path,
-               "--output_file", self.wav_file]
-        )
-        if eff_scale != 1.0:
-            cmd += ["--length_scale", str(eff_scale)]
+        # Reuse the resident worker for this voice unless the length_scale changed
+        worker = self._cli_workers.get(self.model_path)
+        if worker is None or not worker.matches(self.model_path, eff_scale):
+            if worker is not None:
+                worker.close()
+            worker = PiperCliWorker(self._piper_cmd, self.model_path, self.config_path, eff_scale)
+            self._cli_workers[self.model_path] = worker
+        self._cli_workers.move_to_end(self.model_path)
+        while len(self._cli_workers) > 2:
+            self._cli_workers.popitem(last=False)[1].close()
+        total_chars = max(sum(len(s) for s in sentences), 1)
+        done_chars = 0
+        for index, sentence in enumerate(sentences):
+            pcm, sr = worker.synthesize(sentence)
+            done_chars += len(sentence)
+            if len(pcm):
+                yield pcm, sr, done_chars / total_chars, index, None
 
-        completed = subprocess.run(
-            cmd,
-            input=input_text.encode("utf-8"),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
-        if completed.returncode != 0:
-            raise RuntimeError(
-                "Piper synthesis failed:\n"
-                f"CMD: {' '.join(cmd)}\n"
-                f"STDERR:\n{completed.stderr.decode(errors='ignore')}"
+    def _iter_pcm_chunks(self, sentences, eff_scale):
+        """Yield (int16 PCM, sample_rate, fraction_of_text_done, sentence_index, alignment).
+
+        `alignment` is a list of (phoneme, samples) when the voice reports
+        phoneme durations, else None. Sentences that produce no audio are skipped.
+        """
+        if self.segment_cache is not None:
+            return self._iter_segmented_chunks(sentences, eff_scale)
+        return self._iter_synth_chunks(sentences, eff_scale)
+
+    def _iter_segmented_chunks(self, sentences, eff_scale):
+        """Like `_iter_synth_chunks`, but sentences already in `segment_cache` are read back.
+
+        Only the sentences whose (text, voice, length_scale) is not cached are
+        sent to Piper, so editing one line of a document re-synthesizes one line.
+        """
+        cache = self.segment_cache
+        keys = [cache.make_key(sentence, self.model_path, eff_scale) for sentence in sentences]
+        cached = {}
+        missing = []
+        for index, key in enumerate(keys):
+            path = cache.lookup(key)
+            if path is not None:
+                cached[index] = path
+            else:
+                missing.append(index)
+        total_chars = max(sum(len(s) for s in sentences), 1)
+        done_chars = 0
+        fresh = self._iter_synth_chunks([sentences[i] for i in missing], eff_scale) if missing else iter(())
+        try:
+            upcoming = next(fresh, None)
+            for index, sentence in enumerate(sentences):
+                done_chars += len(sentence)
+                if index in cached:
+                    try:
+                        pcm, sr = sf.read(str(cached[index]), dtype="int16")
+                        table = cache.load_sidecars(keys[index]).get("alignment")
+                    except Exception:
+                        # Unreadable entry: synthesize just this sentence instead
+                        for pcm, sr, _, _, alignment in self._iter_synth_chunks([sentence], eff_scale):
+                            self._store_segment(keys[index], pcm, sr, alignment)
+                            yield pcm, sr, done_chars / total_chars, index, alignment
+                        continue
+                    alignment = [(str(p), int(n)) for p, n in table] if table is not None else None
+                    if len(pcm):
+                        yield pcm, sr, done_chars / total_chars, index, alignment
+                    continue
+                while upcoming is not None and missing[upcoming[3]] == index:
+                    pcm, sr, _, _, alignment = upcoming
+                    self._store_segment(keys[index], pcm, sr, alignment)
+                    yield pcm, sr, done_chars / total_chars, index, alignment
+                    upcoming = next(fresh, None)
+        finally:
+            if hasattr(fresh, "close"):
+                fresh.close()
+            cache.flush()
+
+    def _store_segment(self, key, pcm, sample_rate, alignment):
+        sidecars = None
+        if alignment:
+            sidecars = {"alignment": np.array(alignment, dtype=_ALIGNMENT_DTYPE)}
+        try:
+            self.segment_cache.store(
+                key,
+                lambda path: sf.write(str(path), pcm, sample_rate, subtype="PCM_16"),
+                sidecars=sidecars
             )
+        except Exception:
+            pass  # caching is best effort; the audio itself is fine
 
-    def _synthesize_with_embedded(self, input_text, eff_scale):
-        if self._embedded_voice is None or SynthesisConfig is None:
-            raise RuntimeError("Embedded Piper voice unavailable.")
-        syn_config = SynthesisConfig(length_scale=eff_scale)
-        with wave.open(self.wav_file, "wb") as wav_file:
-            self._embedded_voice.synthesize_wav(input_text, wav_file, syn_config=syn_config)
+    def _iter_synth_chunks(self, sentences, eff_scale):
+        if self._use_embedded_voice:
+            if self.synthesis_workers > 1:
+                return self._ensure_parallel().iter_chunks(sentences, eff_scale, self.model_path, self.config_path)
+            return self._iter_embedded_chunks(sentences, eff_scale)
+        return self._iter_cli_chunks(sentences, eff_scale)
+
+    def _ensure_parallel(self):
+        if self._parallel is None:
+            self._parallel = ParallelSynthesizer(
+                self.model_path, self.config_path, self.synthesis_workers, preload=self._preload_voices
+            )
+        return self._parallel
+
+    def _set_raw_pcm(self, pcm, sample_rate):
+        self._raw_pcm = pcm
+        self._raw_path = None
+        self._raw_sample_rate = int(sample_rate)
+        self.TTSDuration = len(pcm) / float(sample_rate) if sample_rate else 0.0
+
+    def _generate_streaming(self, input_text, eff_scale, on_first_audio=None, pace=None):
+        """Synthesize sentence by sentence, publishing audio as soon as each chunk lands."""
+        with self._buffer_lock:
+            self._synth_generation += 1
+            generation = self._synth_generation
+            self._synth_pending = True
+            self._stream_fraction = 0.0
+            self._audio_in_memory = False
+            self._raw_pcm = None
+            self._memmapped = False
+            self._render_generation += 1
+            self._render_pending = False
+            self._prepared = None
+            self.timings = {}
+            self.loop_sentence = self._loop_range = None
+            self._play_buffer = None
+
+        self._discard_memmaps()
+        spoken = self.spoken_text(input_text)
+        sentences = split_sentences(spoken.text)
+        char_offsets = sentence_char_offsets(spoken.text, sentences)
+        chunks = _crossfaded(self._iter_pcm_chunks(sentences, eff_scale))
+
+        raw = clean = None
+        starts = []
+        words = []
+        raw_total = 0
+        sr = None
+        first = True
+        try:
+            for piece, pcm, sr, fraction, index, alignment in chunks:
+                if generation != self._synth_generation:
+                    return False
+                if pace is not None and pace() is False:
+                    return False
+                if first:
+                    # Long documents spill to scratch files as they stream instead of growing in RAM
+                    rate = self._playback_rate(sr)
+                    raw = self._growing_buffer("raw", np.int16, sr)
+                    clean = self._segmented_buffer("clean", self._storage_dtype(), rate)
+                raw.append(piece)
+                if index is not None:
+                    self._add_timings(starts, words, raw_total, char_offsets[index], sentences[index], pcm,
+                                      alignment, spoken.source_span)
+                raw_total += len(piece)
+                softened = soften_pcm(piece)
+                if rate != sr:
+                    softened = resample_audio(softened, sr, rate)
+                with self._buffer_lock:
+                    if generation != self._synth_generation:
+                        return False
+                    if first and abs(self.playback_speed - 1.0) >= 1e-3:
+                        self._play_buffer = self._segmented_buffer("play", self._storage_dtype(), rate)
+                    if self._play_buffer is not None:
+                        self._play_buffer.append(self._to_storage(time_stretch(softened, self.playback_speed, rate)))
+                    clean.append(self._to_storage(softened))
+                    self._clean_audio = clean
+                    # At 1.0x the clean audio is played as is rather than copied
+                    self.audio_data = clean if self._play_buffer is None else self._play_buffer
+                    self._stream_fraction = fraction
+                    if first:
+                        self.sample_rate = rate
+                        self._raw_sample_rate = int(sr)
+                        self.position = 0
+                        self._audio_in_memory = True
+                        self.is_armed = True
+                        self.playback_finished = False
+                    self.timings = self._timing_tables(starts, words)
+                    self._update_loop_range()
+                if first:
+                    first = False
+                    if callable(on_first_audio):
+                        on_first_audio()
+        finally:
+            if generation == self._synth_generation:
+                self._synth_pending = False
+                self._stream_fraction = None
+            chunks.close()
+            if raw is not None:
+                raw.close()
+
+        if generation != self._synth_generation:
+            return False
+        if sr is None:
+            raise RuntimeError("Piper produced no audio for the given text.")
+
+        self._set_raw_pcm(raw.view(), sr)
+        self.TTSDuration = len(self.audio_data) / float(self.sample_rate)
+        with self._buffer_lock:
+            self._memmapped = clean.spilled
+            self._update_loop_range()
+        return True
+
+    @staticmethod
+    def _add_timings(starts, words, raw_offset, char_offset, sentence, pcm, alignment, to_source):
+        starts.append(raw_offset)
+        for a, b, start, end in word_timings(sentence, len(pcm), alignment):
+            a, b = to_source(char_offset + a, char_offset + b)
+            words.append((a, b, raw_offset + start, raw_offset + end))
+
+    @staticmethod
+    def _timing_tables(starts, words):
+        return {
+            "sentences": np.asarray(starts, dtype=np.int64),
+            "words": np.array(words, dtype=WORD_TIMING_DTYPE),
+        }
 
     def _to_piper_scale(self, ui_speed: float) -> float:
         s = max(float(ui_speed), 1e-6)  # guard against zero/negatives
         return (1.0 / s) if self.invert_ui_speed else s
 
+    @property
+    def is_synthesizing(self):
+        """True while a streaming synthesis is still filling the playback buffer."""
+        return self._synth_pending
+
+    def synth_scale_for(self, ui_speed: float) -> float:
+        """Piper length_scale that audio for `ui_speed` is synthesized with."""
+        if self.use_synth_speed and self.speed_mode == "resynth":
+            return self._to_piper_scale(ui_speed)
+        return self.piper_length_scale
+
     def get_progress_percent(self) -> float:
         if self.audio_data is None:
             return 0.0
-        total = len(self.audio_data)
+        total = self._playback_length()
         if total <= 0:
             return 0.0
+        # While streaming, extrapolate the final length from how much text is done
+        pending = self._synth_pending
+        fraction = self._stream_fraction
+        if pending and fraction:
+            total = total / max(fraction, 1e-6)
         # position is advanced in the sounddevice callback; this is safe to read
         pct = 100.0 * (self.position / total)
         if pct < 0.0: pct = 0.0
         if pct > 100.0: pct = 100.0
+        if pending:
+            pct = min(pct, 99.0)  # never report completion before synthesis is done
         return pct
 
+    def get_underrun_stats(self):
+        return {
+            "output_underflows": self.output_underflows,
+            "starved_blocks": self.starved_blocks,
+        }
+
     def getTypingText(self):
         return self.typingText
 
@@ -180,6 +1343,43 @@ class TTSManager:
             if os.path.exists(f):
                 os.remove(f)
 
+    def close(self):
+        """Release background synthesis resources (worker processes, scratch files)."""
+        self._memmapped = False
+        self._discard_memmaps()
+        if self._memmap_dir:
+            shutil.rmtree(self._memmap_dir, ignore_errors=True)
+            self._memmap_dir = None
+        if self._parallel is not None:
+            self._parallel.close()
+            self._parallel = None
+        for worker in self._cli_workers.values():
+            worker.close()
+        self._cli_workers.clear()
+
+    def preload_voices(self, model_basenames):
+        """Load the given voices in the background so later switches are instant.
+
+        With several synthesis workers the voices are loaded by each worker
+        process, and this process keeps none of them.
+        """
+        if PiperVoice is None:
+            return
+        pairs = []
+        for basename in model_basenames:
+            try:
+                pairs.append(self._resolve_voice_paths(basename))
+            except FileNotFoundError:
+                continue
+        self._preload_voices = pairs
+        if self.synthesis_workers > 1:
+            if self._parallel is not None:
+                self._parallel.close()
+                self._parallel = None
+            self._ensure_parallel().warm()
+        else:
+            self.voice_pool.preload(pairs)
+
     def set_voice_model(self, model_basename: str):
         model_path, config_path = self._resolve_voice_paths(model_basename)
         if model_path == self.model_path:
@@ -198,6 +1398,14 @@ class TTSManager:
                 pass
             self.stream = None
 
+        # Abandon any in-flight streaming synthesis for the old voice
+        with self._buffer_lock:
+            self._synth_generation += 1
+            self._synth_pending = False
+            self._render_generation += 1
+            self._render_pending = False
+            self._audio_in_memory = False
+
         self.model_path = model_path
         self.config_path = config_path
         self._embedded_voice = None
@@ -210,53 +1418,342 @@ class TTSManager:
         self.position = 0
         self.is_armed = False
         self._clean_audio = None
+        self._raw_pcm = None
+        self._raw_sample_rate = None
+        self._raw_path = None
+        self._memmapped = False
+        self._discard_memmaps()
+        self._prepared = None
+        self.timings = {}
+        self.loop_sentence = self._loop_range = None
         self._last_synth_scale = None
         self.TTSDuration = 0.0
         self.playback_finished = False
 
-    def TTSGenerate(self, input_text: str, length_scale: float | None = None):
+    def TTSGenerate(self, input_text: str, length_scale: float | None = None, on_first_audio=None, speed=None,
+                    pace=None):
+        """Synthesize `input_text`; returns False if a newer synthesis superseded it.
+
+        In streaming mode `on_first_audio` fires (from this thread) once the first
+        sentence is playable; the rest keeps synthesizing into the playback buffer.
+        `speed` sets the playback speed the new audio is prepared at.
+        `pace()`, if given, is called after each sentence; it may sleep to throttle
+        synthesis, and returning False abandons it (the call then returns False).
+        """
         self.typingText = input_text  # keep for later re-synthesis if speed changes
         eff_scale = self.piper_length_scale if length_scale is None else float(length_scale)
         self.playback_finished = False
+        if speed is not None:
+            self.playback_speed = self._stretch_speed(speed)
 
-        if self._use_embedded_voice:
-            self._synthesize_with_embedded(input_text, eff_scale)
-        else:
-            self._synthesize_with_cli(input_text, eff_scale)
+        if self.stream_synthesis:
+            self._last_text = input_text
+            self._last_synth_scale = eff_scale
+            return self._generate_streaming(input_text, eff_scale, on_first_audio, pace)
+
+        self._audio_in_memory = False
+        self._prepared = None
+        self.loop_sentence = self._loop_range = None
+        spoken = self.spoken_text(input_text)
+        sentences = split_sentences(spoken.text)
+        char_offsets = sentence_char_offsets(spoken.text, sentences)
+        parts = []
+        starts = []
+        words = []
+        raw_total = 0
+        sr = None
+        for piece, pcm, sr, _, index, alignment in _crossfaded(self._iter_pcm_chunks(sentences, eff_scale)):
+            parts.append(piece)
+            if index is not None:
+                self._add_timings(starts, words, raw_total, char_offsets[index], sentences[index], pcm, alignment,
+                                  spoken.source_span)
+            raw_total += len(piece)
+            if pace is not None and pace() is False:
+                return False
+        if sr is None:
+            raise RuntimeError("Piper produced no audio for the given text.")
+        self._set_raw_pcm(np.concatenate(parts), sr)
+        self.timings = self._timing_tables(starts, words)
 
         # update last-synth (store the actual Piper scale used)
         self._last_text = input_text
         self._last_synth_scale = eff_scale
+        return True
 
-        # update duration
-        info = sf.info(self.wav_file)
-        self.TTSDuration = float(info.frames) / float(info.samplerate)
-
-    def load_audio(self):
-        data, sr = sf.read(self.wav_file, dtype="float32")
-        if data.ndim > 1:
-            data = np.mean(data, axis=1)  # mono
-        data = self._soften_audio(data)
-        self._clean_audio = data.copy()
-        data = self._apply_distortion(data, sr)
-        self.audio_data = data.astype(np.float32)
-        self.sample_rate = sr
-        self.position = 0
+    def normalizes_for(self, model_path=None):
+        """Whether text for `model_path` (default: the current voice) is normalized before synthesis."""
+        model_path = self.model_path if model_path is None else model_path
+        return self.text_normalizer is not None and self.text_normalizer.applies_to(model_path)
+
+    def spoken_text(self, text):
+        """The NormalizedText Piper reads for `text` in the current voice."""
+        if self.normalizes_for():
+            return self.text_normalizer.normalize(text)
+        return NormalizedText(text, text, [])
+
+    def presynthesize(self, text, length_scale=None, pace=None):
+        """Synthesize `text` into `segment_cache` only, leaving the loaded audio alone.
+
+        Gives a later TTSGenerate of a document containing `text` a head start
+        (e.g. while the rest of it is still being read). Returns False if there is
+        no segment cache or `pace()` returned False.
+        """
+        if self.segment_cache is None:
+            return False
+        eff_scale = self.piper_length_scale if length_scale is None else float(length_scale)
+        chunks = self._iter_pcm_chunks(split_sentences(self.spoken_text(text).text), eff_scale)
+        try:
+            for _ in chunks:
+                if pace is not None and pace() is False:
+                    return False
+        finally:
+            chunks.close()
+        return True
+
+    def save_audio(self, path):
+        """Write the in-memory PCM to `path` (used when caching a generation)."""
+        pcm = self._raw_pcm
+        if pcm is None and self._raw_path:
+            pcm, _ = sf.read(self._raw_path, dtype="int16")
+        if pcm is None:
+            raise RuntimeError("No synthesized audio to save.")
+        sf.write(str(path), pcm, self._raw_sample_rate, subtype="PCM_16")
+
+    def load_audio(self, path=None, speed=None, timings=None):
+        """Prepare playback from the in-memory PCM, or decode `path` when given.
+
+        `timings` are the tables saved with `path` (see `timings`); audio loaded
+        from a file without them has no sentence index.
+        """
+        if speed is not None:
+            self.playback_speed = self._stretch_speed(speed)
+        if path is not None or timings is not None:
+            self.timings = dict(timings or {})
+            self.loop_sentence = self._loop_range = None
+        if path is None and self._raw_pcm is None:
+            path = self._raw_path or self.wav_file
+        key = None
+        prepared = self._prepared
+        if path is not None:
+            info = sf.info(str(path))
+            if self._should_memmap(info.frames, info.samplerate):
+                self._prepared = None
+                self._load_memmapped(str(path), info.frames, info.samplerate)
+                return
+            stat = os.stat(path)
+            key = ((os.path.abspath(path), stat.st_size, stat.st_mtime_ns), self._playback_rate(info.samplerate))
+            if prepared is not None and prepared[0] == key:
+                self._set_raw_pcm(prepared[1], info.samplerate)
+            else:
+                # A different file: let the previous audio go before decoding this one
+                self._prepared = prepared = None
+                pcm, file_sr = sf.read(str(path), dtype="int16")
+                if pcm.ndim > 1:
+                    pcm = pcm.mean(axis=1).astype(np.int16)  # mono
+                self._set_raw_pcm(pcm, file_sr)
+        sr = self._raw_sample_rate
+        if self._should_memmap(len(self._raw_pcm), sr):
+            self._prepared = None
+            self._load_memmapped(None, len(self._raw_pcm), sr)
+            return
+        rate = self._playback_rate(sr)
+        if key is None:
+            key = (id(self._raw_pcm), rate)
+            if prepared is not None and prepared[1] is self._raw_pcm and prepared[0][1] == rate:
+                key = prepared[0]  # the file decoded earlier
+        if prepared is not None and prepared[0] == key and prepared[1] is self._raw_pcm:
+            clean = prepared[2]
+        else:
+            self._prepared = None
+            clean = soften_pcm(self._raw_pcm)
+            if rate != sr:
+                clean = resample_audio(clean, sr, rate)
+            clean = self._to_storage(clean)
+            self._prepared = (key, self._raw_pcm, clean)
+        self._memmapped = False
+        self._discard_memmaps()
+        with self._buffer_lock:
+            self._clean_audio = clean
+            self.sample_rate = rate
+            self._render_playback_locked()
+            self.position = 0
+        self.playback_finished = False
+        self._audio_in_memory = True
+
+    def _playback_rate(self, source_rate):
+        """Sample rate to prepare audio at: the default output device's, when known."""
+        if not self.resample_to_device:
+            return int(source_rate)
+        try:
+            rate = int(round(float(sd.query_devices(kind="output")["default_samplerate"])))
+        except Exception:
+            return int(source_rate)
+        return rate if rate > 0 else int(source_rate)
+
+    def _should_memmap(self, frames, sample_rate):
+        return (self.memmap_min_seconds is not None and sample_rate
+                and frames >= self.memmap_min_seconds * sample_rate)
+
+    def _scratch_path(self, name, dtype):
+        if self._memmap_dir is None:
+            self._memmap_dir = tempfile.mkdtemp(prefix="echotype_play_")
+        self._memmap_counter += 1
+        suffix = "i16" if np.dtype(dtype) == np.int16 else "f32"
+        path = os.path.join(self._memmap_dir, f"{self._memmap_counter}-{name}.{suffix}")
+        self._memmap_paths.append(path)
+        return path
+
+    def _new_memmap(self, name, length):
+        path = self._scratch_path(name, np.float32)
+        return np.memmap(path, dtype=np.float32, mode="w+", shape=(max(int(length), 1),))
+
+    def _growing_buffer(self, name, dtype, sample_rate):
+        """Streaming buffer that moves to a scratch file past `memmap_min_seconds`."""
+        if self.memmap_min_seconds is None or not sample_rate:
+            return _GrowingAudioBuffer(dtype=dtype)
+        return _GrowingAudioBuffer(dtype=dtype, spill_path=self._scratch_path(name, dtype),
+                                   spill_after=int(self.memmap_min_seconds * sample_rate))
+
+    def _segmented_buffer(self, name, dtype, sample_rate, spill_after=None):
+        """SegmentedAudio that moves to scratch files past `spill_after` samples.
+
+        `spill_after` defaults to `memmap_min_seconds` of audio.
+        """
+        if self.memmap_min_seconds is None or not sample_rate:
+            return SegmentedAudio(dtype=dtype)
+        if spill_after is None:
+            spill_after = int(self.memmap_min_seconds * sample_rate)
+        return SegmentedAudio(dtype=dtype, spill_path=lambda: self._scratch_path(name, dtype),
+                              spill_after=spill_after)
+
+    def _discard_memmaps(self, keep=()):
+        """Delete scratch files that are no longer referenced by the loaded audio."""
+        keep = {os.path.abspath(name)
+                for a in (*keep, self._raw_pcm) if a is not None
+                for name in getattr(a, "filenames", None) or [getattr(a, "filename", None) or ""]}
+        remaining = []
+        for path in self._memmap_paths:
+            if os.path.abspath(path) in keep:
+                remaining.append(path)
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError:
+                remaining.append(path)  # still mapped (Windows); retried next time
+        self._memmap_paths = remaining
+
+    def _iter_source_blocks(self, path, block):
+        if path is None:
+            pcm = self._raw_pcm
+            for start in range(0, len(pcm), block):
+                yield pcm[start:start + block].astype(np.float32) / 32768.0
+            return
+        for chunk in sf.blocks(path, blocksize=block, dtype="float32"):
+            yield chunk.mean(axis=1) if chunk.ndim > 1 else chunk
+
+    def _load_memmapped(self, path, frames, sample_rate, block=1 << 18):
+        """Soften the source block by block into a scratch file and play from its mapping."""
+        clean = self._new_memmap("clean", frames)
+        pos = 0
+        for chunk in self._iter_source_blocks(path, block):
+            if len(chunk):
+                clean[pos:pos + len(chunk)] = chunk
+                pos += len(chunk)
+        clean = _soften_in_place(clean[:pos], block)
+        rate = self._playback_rate(sample_rate)
+        if rate != sample_rate:
+            clean = resample_audio(clean, sample_rate, rate,
+                                   out=self._new_memmap("clean", -(-pos * rate // sample_rate)), block=block)
+
+        with self._buffer_lock:
+            if path is not None:
+                self._raw_pcm = None
+                self._raw_path = path
+                self._raw_sample_rate = int(sample_rate)
+            self._clean_audio = clean
+            self.sample_rate = rate
+            self._memmapped = True
+            self._render_playback_locked()
+            self.position = 0
         self.playback_finished = False
-        if self.sample_rate and len(self.audio_data):
-            self.TTSDuration = len(self.audio_data) / float(self.sample_rate)
+        self._audio_in_memory = True
+        self._discard_memmaps(keep=(clean, self.audio_data))
+
+    def _stretch_in_background(self, pieces, target, frames, ready=0):
+        """Append stretched `pieces` to `target` (a SegmentedAudio) and return it.
+
+        Pieces are rendered until `target` holds `ready` samples (at least
+        one piece) before returning; a worker thread appends the rest while
+        the callback waits at the end of what is ready, as it does during
+        streaming synthesis. `frames` is the expected final length. Call with
+        `_buffer_lock` held.
+        """
+        for piece in pieces:
+            target.append(self._to_storage(piece))
+            if len(target) >= ready:
+                break
+        self._render_pending = True
+        self.TTSDuration = frames / float(self.sample_rate)
+        worker = threading.Thread(target=self._finish_stretch,
+                                  args=(pieces, target, self._render_generation), daemon=True)
+        worker.start()
+        return target
+
+    def _finish_stretch(self, pieces, target, generation):
+        try:
+            for piece in pieces:
+                if generation != self._render_generation:
+                    return
+                target.append(self._to_storage(piece))
+        finally:
+            with self._buffer_lock:
+                if generation == self._render_generation:
+                    self._render_pending = False
+                    self.TTSDuration = len(target) / float(self.sample_rate)
+                    self._update_loop_range()
 
     def play_callback(self, outdata, frames, time_info, status):
-        if self.is_paused or self.audio_data is None:
-            outdata[:] = np.zeros((frames, 1), dtype=np.float32)
+        # Runs on the PortAudio thread: copy straight into `outdata` and never
+        # allocate, so a GC pause on the Tk thread cannot stretch a callback.
+        if status.output_underflow:
+            self.output_underflows += 1
+        out = outdata[:, 0]
+        audio = self.audio_data
+        if self.is_paused or audio is None:
+            out.fill(0.0)
+            return
+        position = self.position
+        count = len(audio) - position
+        if count > frames:
+            count = frames
+        if count > 0:
+            if isinstance(audio, SegmentedAudio):
+                audio.read_into(position, out[:count])
+            elif audio.dtype == np.int16:
+                np.multiply(audio[position:position + count], _INT16_SCALE, out=out[:count])
+            else:
+                out[:count] = audio[position:position + count]
+        else:
+            count = 0
+        if count < frames:
+            out[count:].fill(0.0)
+        if self.distortion_enabled and count:
+            self._distortion.process(out[:count])
+        pending = self._synth_pending or self._render_pending
+        if pending:
+            # Caught up with the synthesizer: play silence and wait for more audio
+            if count < frames:
+                self.starved_blocks += 1
+            self.position = position + count
+        else:
+            self.position = position + frames
+        loop = self._loop_range
+        if loop is not None and self.position >= loop[1]:
+            self.position = loop[0]
             return
-        end = min(self.position + frames, len(self.audio_data))
-        chunk = self.audio_data[self.position:end]
-        out_frames = np.zeros((frames, 1), dtype=np.float32)
-        out_frames[:len(chunk), 0] = chunk
-        outdata[:] = out_frames
-        self.position += frames
-        if self.position >= len(self.audio_data):
+        if not pending and self.position >= len(audio):
             self.is_armed = False
             self.playback_finished = True
             raise sd.CallbackStop
@@ -277,9 +1774,14 @@ class TTSManager:
         if not self.is_armed:
             self.prepareTTS(speed)
         self._close_stream()
+        self._distortion.configure(self.sample_rate)
+        self._distortion.reset()
         self.stream = sd.OutputStream(
             samplerate=self.sample_rate,
             channels=1,
+            dtype="float32",
+            blocksize=self.stream_blocksize,
+            latency=self.stream_latency,
             callback=self.play_callback
         )
         self.is_paused = False
@@ -296,12 +1798,17 @@ class TTSManager:
 
     def prepareTTS(self, speed=1.0):
         if self.use_synth_speed:
-            target_scale = self._to_piper_scale(speed)  # map UI scale to Piper scale
+            target_scale = self.synth_scale_for(speed)  # map UI scale to Piper scale
             if self._last_synth_scale is None or abs(target_scale - self._last_synth_scale) > 1e-6:
                 text = self._last_text or self.typingText
-                self.TTSGenerate(text, length_scale=target_scale)
+                self.TTSGenerate(text, length_scale=target_scale, speed=speed)
 
-        self.load_audio()
+        if self._audio_in_memory and self.audio_data is not None:
+            # Audio already reflects the last synthesis; re-time if needed and rewind
+            self.set_playback_speed(speed)
+            self.position = 0
+        else:
+            self.load_audio(speed=speed)
         self.is_armed = True
         self.playback_finished = False
 
@@ -313,37 +1820,181 @@ class TTSManager:
         self.playback_finished = False
         self.is_armed = False
 
-    def _soften_audio(self, data):
-        if data.size == 0:
-            return data
-        peak = np.max(np.abs(data))
-        if peak > 0:
-            data = data / max(peak / 0.9, 1.0)
-        softened = np.tanh(data * 0.85)
-        kernel = np.array([0.2, 0.6, 0.2], dtype=np.float32)
-        return np.convolve(softened, kernel, mode="same")
-
-    def _apply_distortion(self, data, sample_rate):
-        if not self.distortion_enabled or sample_rate is None or sample_rate <= 0:
-            return data
-        try:
-            nyquist = sample_rate * 0.5
-            low = max(300.0 / nyquist, 0.0001)
-            high = min(3400.0 / nyquist, 0.99)
-            if low >= high:
-                return data
-            b, a = butter(4, [low, high], btype="band")
-            filtered = lfilter(b, a, data)
-        except Exception:
-            filtered = data
-        crushed = np.tanh(filtered * 1.3)
-        combined = crushed
-        return np.clip(combined, -1.0, 1.0)
+    def _raw_to_position(self, raw):
+        # Round up so that mapping a boundary back with _position_to_raw lands on it
+        scale = self.sample_rate / float(self._raw_sample_rate) / self.playback_speed
+        return int(np.ceil(raw * scale - 1e-6))
+
+    def _position_to_raw(self, position):
+        scale = self._raw_sample_rate / float(self.sample_rate) * self.playback_speed
+        return int(position * scale + 1e-6)
+
+    def _sentence_starts(self):
+        starts = self.timings.get("sentences")
+        if starts is None or not len(starts) or not self.sample_rate or not self._raw_sample_rate:
+            return None
+        return starts
+
+    def word_index_at(self, position=None):
+        """Row of `timings["words"]` being spoken at `position` (default: now), or None."""
+        words = self.timings.get("words")
+        if words is None or not len(words) or not self.sample_rate or not self._raw_sample_rate:
+            return None
+        raw = self._position_to_raw(self.position if position is None else position)
+        index = int(np.searchsorted(words["start"], raw, side="right")) - 1
+        return index if index >= 0 else None
+
+    def word_at(self, position=None):
+        """(char_start, char_end) in the typing text of the word being spoken, or None."""
+        index = self.word_index_at(position)
+        if index is None:
+            return None
+        row = self.timings["words"][index]
+        return int(row["char_start"]), int(row["char_end"])
+
+    def sentence_count(self):
+        starts = self._sentence_starts()
+        return 0 if starts is None else len(starts)
+
+    def sentence_index_at(self, position=None):
+        """Index of the sentence playing at `position` (default: now), or None without an index."""
+        starts = self._sentence_starts()
+        if starts is None:
+            return None
+        raw = self._position_to_raw(self.position if position is None else position)
+        return max(0, int(np.searchsorted(starts, raw, side="right")) - 1)
+
+    def sentence_range(self, index):
+        """(start, end) of sentence `index` in playback samples."""
+        starts = self._sentence_starts()
+        start = self._raw_to_position(starts[index])
+        total = self._playback_length() if self.audio_data is not None else start
+        end = self._raw_to_position(starts[index + 1]) if index + 1 < len(starts) else total
+        return start, min(end, total)
+
+    def seek_to_sentence(self, index):
+        """Move playback to the start of sentence `index` (clamped); returns the index used."""
+        starts = self._sentence_starts()
+        if starts is None:
+            return None
+        index = min(max(int(index), 0), len(starts) - 1)
+        if self.stream is not None and not getattr(self.stream, "active", True):
+            self._close_stream()  # finished streams cannot be resumed; playTTS reopens at the new spot
+        self.position = self.sentence_range(index)[0]
+        self.playback_finished = False
+        self.is_armed = True
+        return index
+
+    def replay_sentence(self, grace_seconds=1.0):
+        """Restart the current sentence, or the previous one if it only just began."""
+        index = self.sentence_index_at()
+        if index is None:
+            self.position = 0
+            return None
+        start = self.sentence_range(index)[0]
+        if index > 0 and self.position - start < grace_seconds * self.sample_rate:
+            index -= 1
+        return self.seek_to_sentence(index)
+
+    def set_loop_sentence(self, enabled):
+        """Repeat the sentence playing now until disabled; returns its index or None."""
+        self.loop_sentence = self.sentence_index_at() if enabled else None
+        self._update_loop_range()
+        return self.loop_sentence
+
+    def _update_loop_range(self):
+        index = self.loop_sentence
+        if index is None or self._sentence_starts() is None or index >= self.sentence_count():
+            self._loop_range = None
+            return
+        start, end = self.sentence_range(index)
+        if self._synth_pending and index + 1 >= self.sentence_count():
+            self._loop_range = None  # its end is not known until the next sentence lands
+        else:
+            self._loop_range = (start, end) if end > start else None
+
+    def _storage_dtype(self):
+        return np.int16 if self.compact_audio else np.float32
+
+    def _to_storage(self, samples):
+        """float32 audio in the in-memory format; may reuse `samples` as scratch."""
+        return _quantize_int16(samples) if self.compact_audio else samples
+
+    @staticmethod
+    def _stretch_block_frames(sample_rate):
+        """WSOLA frames in about 30 s of output, the unit long audio is stretched in."""
+        return 30 * int(sample_rate) // max(64, int(0.015 * sample_rate))
+
+    def _stretch_speed(self, ui_speed):
+        if self.speed_mode != "stretch":
+            return 1.0
+        return max(float(ui_speed), 0.05)
+
+    def _playback_length(self):
+        """Length of `audio_data` once a background stretch has finished."""
+        if self._render_pending:
+            return int(round(self.TTSDuration * self.sample_rate))
+        return len(self.audio_data)
+
+    def _render_playback_locked(self):
+        """Rebuild `audio_data` from `_clean_audio` at the current playback speed."""
+        self._render_audio_locked()
+        self._update_loop_range()
+
+    def _render_audio_locked(self):
+        self._render_generation += 1
+        self._render_pending = False
+        self._play_buffer = None
+        speed = self.playback_speed
+        clean = self._clean_audio
+        rate = self.sample_rate
+        if abs(speed - 1.0) < 1e-3:
+            self.audio_data = clean
+        elif isinstance(clean, SegmentedAudio):
+            # Streamed audio is stretched segment by segment into new segments
+            segments = list(clean.segments)
+            pieces = (time_stretch(segment, speed, rate) for segment in segments)
+            if clean.spilled and not self._synth_pending:
+                target = self._segmented_buffer("play", self._storage_dtype(), rate, spill_after=0)
+                self.audio_data = self._stretch_in_background(pieces, target, len(clean) / speed, ready=30 * rate)
+                return
+            target = self._segmented_buffer("play", self._storage_dtype(), rate)
+            for piece in pieces:
+                target.append(self._to_storage(piece))
+            self.audio_data = target
+            if self._synth_pending:
+                # The synthesis thread appends later sentences to this buffer too
+                self._play_buffer = target
+                return
+        elif self._memmapped:
+            pieces = iter_time_stretch(clean, speed, rate, self._stretch_block_frames(rate))
+            target = self._segmented_buffer("play", self._storage_dtype(), rate, spill_after=0)
+            self.audio_data = self._stretch_in_background(pieces, target, len(clean) / speed)
+            return
+        else:
+            self.audio_data = self._to_storage(time_stretch(clean, speed, rate))
+        if not self._synth_pending:
+            self.TTSDuration = len(self.audio_data) / float(rate)
+
+    def set_playback_speed(self, speed):
+        """Time-stretch the loaded audio to `speed`, keeping the listener's place."""
+        target = self._stretch_speed(speed)
+        if abs(target - self.playback_speed) < 1e-6:
+            return
+        previous = self.playback_speed
+        self.playback_speed = target
+        with self._buffer_lock:
+            if self._clean_audio is not None and self.sample_rate:
+                self._render_playback_locked()
+                self.position = int(self.position * previous / target)
+        if self._memmapped:
+            self._discard_memmaps(keep=(self._clean_audio, self.audio_data))
 
     def set_distortion_enabled(self, enabled):
-        self.distortion_enabled = bool(enabled)
-        if self._clean_audio is not None and self.sample_rate:
-            processed = self._apply_distortion(self._clean_audio.copy(), self.sample_rate)
-            self.audio_data = processed.astype(np.float32)
-            if self.stream is None:
-                self.position = 0
+        """Toggle the radio effect; applied per playback block, so it is instant."""
+        enabled = bool(enabled)
+        if enabled and not self.distortion_enabled:
+            # Start from a quiet filter so stale state from an earlier pass cannot ring
+            self._distortion.configure(self.sample_rate)
+            self._distortion.reset()
+        self.distortion_enabled = enabled
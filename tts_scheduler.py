@@ -0,0 +1,171 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright (C) 2025 echoType
+
+import heapq
+import itertools
+import threading
+
+# Lower runs first
+FOREGROUND = 0
+SPECULATIVE = 10
+
+
+class TTSJob:
+    """A queued unit of synthesis work, created by `TTSJobScheduler.submit`.
+
+    The work function receives the job and should pass `job.checkpoint` to
+    `TTSManager.TTSGenerate(pace=...)` so a cancelled job stops between sentences.
+    """
+
+    def __init__(self, work, key, priority, seq):
+        self.work = work
+        self.key = key
+        self.priority = priority
+        self.seq = seq
+        self.result = None
+        self.error = None
+        self._cancelled = threading.Event()
+        self._done = threading.Event()
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def checkpoint(self):
+        """Return False once the job is cancelled (usable as a `pace` hook)."""
+        return not self._cancelled.is_set()
+
+    def wait_cancelled(self, timeout):
+        """Sleep up to `timeout` seconds, waking early if cancelled; True if cancelled."""
+        return self._cancelled.wait(timeout)
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+    def add_done_callback(self, fn):
+        """Call `fn(job)` when the job finishes, is cancelled or fails (from the worker thread)."""
+        with self._lock:
+            if not self._done.is_set():
+                self._callbacks.append(fn)
+                return
+        fn(self)
+
+    def _finish(self):
+        with self._lock:
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for fn in callbacks:
+            try:
+                fn(self)
+            except Exception:
+                pass
+
+
+class TTSJobScheduler:
+    """Runs synthesis jobs one at a time on a single worker thread, by priority.
+
+    Only one job ever runs, so two jobs never share TTSManager state or write
+    the same file. Jobs with a `key` (the generation cache key of their output)
+    are deduplicated: submitting a key that is already queued or running
+    returns that job. A submit at a higher priority cancels it instead and
+    queues the new work, so a foreground request for audio being synthesized
+    speculatively runs its own (streaming) work rather than waiting on the
+    speculative one. A FOREGROUND submit cancels every other job, so the
+    latest user request is the only one consuming CPU.
+    """
+
+    def __init__(self):
+        self._heap = []  # (priority, seq, job)
+        self._active = {}  # key -> queued or running job
+        self._running = None
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = None
+
+    def submit(self, work, key=None, priority=FOREGROUND):
+        """Queue `work(job)` and return its TTSJob (or the in-flight job for `key`)."""
+        with self._cond:
+            job = self._active.get(key) if key is not None else None
+            if job is not None and priority < job.priority:
+                job.cancel()
+            if job is None or job.cancelled:
+                job = TTSJob(work, key, priority, next(self._seq))
+                if key is not None:
+                    self._active[key] = job
+                heapq.heappush(self._heap, (job.priority, job.seq, job))
+            if priority == FOREGROUND:
+                self._cancel_others_locked(keep=job)
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._worker, daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+            return job
+
+    def cancel_all(self):
+        with self._cond:
+            self._cancel_others_locked(keep=None)
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cancel_others_locked(keep=None)
+            self._cond.notify_all()
+
+    def _cancel_others_locked(self, keep):
+        jobs = [entry[2] for entry in self._heap]
+        if self._running is not None:
+            jobs.append(self._running)
+        for job in jobs:
+            if job is not keep:
+                job.cancel()
+
+    def _next_job_locked(self):
+        while self._heap:
+            _, _, job = heapq.heappop(self._heap)
+            if job.done or job is self._running:
+                continue
+            return job
+        return None
+
+    def _retire_locked(self, job):
+        if job.key is not None and self._active.get(job.key) is job:
+            del self._active[job.key]
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                job = self._next_job_locked()
+                while job is None and not self._closed:
+                    self._cond.wait()
+                    job = self._next_job_locked()
+                if job is None:
+                    break
+                self._running = job
+            # Cancelled jobs are still finished so their callbacks run
+            if not job.cancelled:
+                try:
+                    job.result = job.work(job)
+                except Exception as exc:
+                    job.error = exc
+            with self._cond:
+                self._running = None
+                self._retire_locked(job)
+            job._finish()
+        with self._cond:
+            leftover = [job for _, _, job in self._heap if not job.done]
+            self._heap = []
+            for job in leftover:
+                self._retire_locked(job)
+        for job in set(leftover):
+            job._finish()